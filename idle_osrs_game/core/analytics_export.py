@@ -0,0 +1,357 @@
+import csv
+import os
+import struct
+import sys
+import zipfile
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .game_io import read_save_profile
+from .profile_archive import ProfileArchive
+
+# Profiles stream through the export in this order:
+#   sources     save files (*.json, directories are walked) and profile archives (*.rspa)
+#   parsing     save files are parsed in batches on a process pool; archives are read from their mmap
+#   writers     append each profile to per-column buffers that are flushed to disk as they fill
+# At most PENDING_BATCHES_PER_WORKER batches per worker are in flight and each column buffers
+# at most COLUMN_BUFFER_SIZE values, so memory stays flat however many profiles are exported.
+DEFAULT_BATCH_SIZE = 256 # Save files parsed per pool task; amortizes the inter-process overhead
+PENDING_BATCHES_PER_WORKER = 2
+COLUMN_BUFFER_SIZE = 65536
+
+SAVE_FILE_SUFFIX = ".json"
+ARCHIVE_FILE_SUFFIX = ".rspa"
+
+# .npy v1.0 header with room for any 64-bit length, so it can be rewritten in place once the
+# final row count is known
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_NPY_HEADER_SIZE = 128
+
+
+class ExportResult:
+    def __init__(self, profiles, skills, items, inventory_entries, skipped):
+        self.profiles = profiles
+        self.skills = skills # Skill names, in column order
+        self.items = items # Item ids, in inventory matrix column order
+        self.inventory_entries = inventory_entries # Non-zero cells of the inventory matrix
+        self.skipped = skipped # "path: reason" for every file that could not be exported
+
+
+def iter_sources(paths):
+    """Yields ("save", path, profile_id) and ("archive", path, None) for every input path.
+    Directories are walked in sorted order; a save file's profile id is its path relative
+    to the directory given, without the .json suffix.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for dir_path, dir_names, file_names in os.walk(path):
+                dir_names.sort()
+                for file_name in sorted(file_names):
+                    file_path = os.path.join(dir_path, file_name)
+                    if file_name.endswith(SAVE_FILE_SUFFIX):
+                        profile_id = os.path.relpath(file_path, path)[:-len(SAVE_FILE_SUFFIX)]
+                        yield "save", file_path, profile_id.replace(os.sep, "/")
+                    elif file_name.endswith(ARCHIVE_FILE_SUFFIX):
+                        yield "archive", file_path, None
+        elif path.endswith(ARCHIVE_FILE_SUFFIX):
+            yield "archive", path, None
+        else:
+            yield "save", path, os.path.splitext(os.path.basename(path))[0]
+
+
+_INT64_RANGE = (-2 ** 63, 2 ** 63 - 1)
+
+
+def _as_int(value, what):
+    # Whole-number floats (e.g. 3.0 from a hand-edited save) are accepted; anything else is not
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if not isinstance(value, int) or isinstance(value, bool) or not _INT64_RANGE[0] <= value <= _INT64_RANGE[1]:
+        raise ValueError(f"{what} {value!r} is not a 64-bit integer")
+    return value
+
+
+def _as_float(value, what):
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise ValueError(f"{what} {value!r} is not a number")
+    return float(value)
+
+
+def _compact_profile(profile):
+    """Flattens a profile to ((skill, level, xp), ...), ((item_id, quantity), ...) for cheap pickling.
+    Raises ValueError if a level, XP or quantity doesn't fit its output column.
+    """
+    if not isinstance(profile["skills"], dict) or not isinstance(profile["inventory"], dict):
+        raise ValueError("skills and inventory must be objects")
+    skills = []
+    for skill_name, skill_data in profile["skills"].items():
+        if not isinstance(skill_data, dict):
+            raise ValueError(f"{skill_name} is not an object")
+        skills.append((skill_name, _as_int(skill_data.get("level", 1), f"{skill_name} level"),
+                       _as_float(skill_data.get("xp", 0), f"{skill_name} XP")))
+    inventory = tuple((item_id, _as_int(quantity, f"{item_id} quantity"))
+                      for item_id, quantity in profile["inventory"].items() if quantity)
+    return tuple(skills), inventory
+
+
+def _read_save_batch(batch):
+    """Pool task: parses a batch of (path, profile_id) save files.
+    Returns (profiles, skipped) where profiles are (profile_id, skills, inventory) tuples.
+    """
+    profiles = []
+    skipped = []
+    for path, profile_id in batch:
+        try:
+            profile = read_save_profile(path)
+        except (IOError, ValueError) as e:
+            skipped.append(f"{path}: {e}")
+            continue
+        if profile is None:
+            continue # Other JSON, e.g. a command log or data table
+        try:
+            profiles.append((profile_id,) + _compact_profile(profile))
+        except ValueError as e:
+            skipped.append(f"{path}: {e}")
+    return profiles, skipped
+
+
+def iter_profiles(paths, workers=None, batch_size=DEFAULT_BATCH_SIZE, skipped=None):
+    """Yields (profile_id, skills, inventory) for every profile under paths, in source order
+    (see _compact_profile for the tuple layout). Save files are parsed on a pool of workers
+    processes (None: one per CPU; 1: in this process). JSON files that aren't saves are ignored;
+    files that can't be read are left out and described in the skipped list, if one is given.
+    """
+    skipped = [] if skipped is None else skipped
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    pending = deque()
+    batch = []
+
+    def finished_batches(limit):
+        # Yields results of the oldest in-flight batches until at most limit remain
+        while len(pending) > limit:
+            profiles, batch_skipped = pending.popleft().result()
+            skipped.extend(batch_skipped)
+            yield profiles
+
+    def submit_batch():
+        if pool is None:
+            profiles, batch_skipped = _read_save_batch(batch)
+            skipped.extend(batch_skipped)
+            return profiles
+        pending.append(pool.submit(_read_save_batch, list(batch)))
+        return ()
+
+    try:
+        for kind, path, profile_id in iter_sources(paths):
+            if kind == "save":
+                batch.append((path, profile_id))
+                if len(batch) >= batch_size:
+                    yield from submit_batch()
+                    batch.clear()
+                    for profiles in finished_batches(workers * PENDING_BATCHES_PER_WORKER):
+                        yield from profiles
+                continue
+
+            # Archives are read here: the mmap makes that cheaper than shipping records to a worker
+            if batch:
+                yield from submit_batch()
+                batch.clear()
+            for profiles in finished_batches(0):
+                yield from profiles
+            try:
+                with ProfileArchive(path) as archive:
+                    for archived_id, profile in archive.iter_profiles():
+                        yield (archived_id,) + _compact_profile(profile)
+            except (IOError, ValueError) as e:
+                skipped.append(f"{path}: {e}")
+
+        if batch:
+            yield from submit_batch()
+        for profiles in finished_batches(0):
+            yield from profiles
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+class _NpyColumn:
+    """One-dimensional .npy file written incrementally, without NumPy.
+    Values are buffered in an array and appended to the file as the buffer fills;
+    close() rewrites the header with the final length.
+    """
+
+    def __init__(self, path, typecode, descr):
+        self.path = path
+        self.descr = descr
+        self.count = 0
+        self._typecode = typecode
+        self._buffer = array(typecode)
+        self._file = open(path, "wb")
+        self._file.write(self._header())
+
+    def _header(self):
+        header = f"{{'descr': '{self.descr}', 'fortran_order': False, 'shape': ({self.count},), }}"
+        header = header.encode("latin1").ljust(_NPY_HEADER_SIZE - len(_NPY_MAGIC) - 3) + b"\n"
+        return _NPY_MAGIC + struct.pack("<H", len(header)) + header
+
+    def append(self, value):
+        self._buffer.append(value)
+        if len(self._buffer) >= COLUMN_BUFFER_SIZE:
+            self.flush()
+
+    def fill(self, value, count):
+        """Appends count copies of value (used to backfill a column that appears late)."""
+        while count > 0:
+            chunk = min(count, COLUMN_BUFFER_SIZE)
+            self._buffer.extend(array(self._typecode, [value]) * chunk)
+            self.flush()
+            count -= chunk
+
+    def flush(self):
+        if sys.byteorder == "big":
+            self._buffer.byteswap() # .npy descrs below are little-endian
+        self._buffer.tofile(self._file)
+        self.count += len(self._buffer)
+        self._buffer = array(self._typecode)
+
+    def close(self):
+        self.flush()
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+
+
+def _column_name(name):
+    return "".join(c if c.isalnum() else "_" for c in name.lower())
+
+
+class NpyExportWriter:
+    """Writes the export as NumPy files in out_dir:
+        profile_ids.txt                 one profile id per line, in row order
+        <skill>_level.npy, <skill>_xp.npy   int64 / float64 column per skill, one row per profile
+        items.txt                       one item id per line, in inventory column order
+        inventory.npz                   COO player x item matrix: row, col, data, shape
+    The inventory matrix loads with scipy.sparse.coo_matrix((f["data"], (f["row"], f["col"])), shape=f["shape"]).
+    Skills missing from a profile are exported as level 0, XP 0.
+    """
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        os.makedirs(out_dir, exist_ok=True)
+        self.rows = 0
+        self.skills = {} # skill_name -> (level column, xp column)
+        self.items = {} # item_id -> matrix column
+        self.inventory_entries = 0
+        self._profile_ids = open(os.path.join(out_dir, "profile_ids.txt"), "w", encoding="utf-8")
+        self._inventory = {field: _NpyColumn(os.path.join(out_dir, f".inventory_{field}.npy"), typecode, descr)
+                           for field, typecode, descr in (("row", "q", "<i8"), ("col", "q", "<i8"), ("data", "q", "<i8"))}
+
+    def _skill_columns(self, skill_name):
+        columns = self.skills.get(skill_name)
+        if columns is None:
+            base = os.path.join(self.out_dir, _column_name(skill_name))
+            columns = (_NpyColumn(base + "_level.npy", "q", "<i8"), _NpyColumn(base + "_xp.npy", "d", "<f8"))
+            columns[0].fill(0, self.rows) # Earlier profiles didn't have this skill
+            columns[1].fill(0.0, self.rows)
+            self.skills[skill_name] = columns
+        return columns
+
+    def write(self, profile_id, skills, inventory):
+        self._profile_ids.write(profile_id + "\n")
+        written = set()
+        for skill_name, level, xp in skills:
+            written.add(skill_name)
+            level_column, xp_column = self._skill_columns(skill_name)
+            level_column.append(level)
+            xp_column.append(xp)
+        if len(written) < len(self.skills):
+            for skill_name, (level_column, xp_column) in self.skills.items():
+                if skill_name not in written:
+                    level_column.append(0)
+                    xp_column.append(0.0)
+        for item_id, quantity in inventory:
+            col = self.items.setdefault(item_id, len(self.items))
+            self._inventory["row"].append(self.rows)
+            self._inventory["col"].append(col)
+            self._inventory["data"].append(quantity)
+        self.inventory_entries += len(inventory)
+        self.rows += 1
+
+    def close(self):
+        self._profile_ids.close()
+        for level_column, xp_column in self.skills.values():
+            level_column.close()
+            xp_column.close()
+        with open(os.path.join(self.out_dir, "items.txt"), "w", encoding="utf-8") as f:
+            f.writelines(item_id + "\n" for item_id in self.items)
+
+        shape = _NpyColumn(os.path.join(self.out_dir, ".inventory_shape.npy"), "q", "<i8")
+        shape.append(self.rows)
+        shape.append(len(self.items))
+        self._inventory["shape"] = shape
+        # .npz is a zip of .npy members; stored uncompressed so np.load can read them quickly
+        npz_path = os.path.join(self.out_dir, "inventory.npz")
+        with zipfile.ZipFile(npz_path + ".tmp", "w", zipfile.ZIP_STORED, allowZip64=True) as npz:
+            for field, column in self._inventory.items():
+                column.close()
+                npz.write(column.path, field + ".npy")
+                os.remove(column.path)
+        os.replace(npz_path + ".tmp", npz_path)
+
+
+class CsvExportWriter:
+    """Writes the export as CSV in out_dir, in long form so it can be streamed:
+        skills.csv      profile_id, skill, level, xp
+        inventory.csv   profile_id, item_id, quantity (the non-zero cells of the player x item matrix)
+    """
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        os.makedirs(out_dir, exist_ok=True)
+        self.rows = 0
+        self.skills = {}
+        self.items = {}
+        self.inventory_entries = 0
+        self._files = [open(os.path.join(out_dir, name), "w", newline="", encoding="utf-8")
+                       for name in ("skills.csv", "inventory.csv")]
+        self._skills_csv, self._inventory_csv = (csv.writer(f) for f in self._files)
+        self._skills_csv.writerow(("profile_id", "skill", "level", "xp"))
+        self._inventory_csv.writerow(("profile_id", "item_id", "quantity"))
+
+    def write(self, profile_id, skills, inventory):
+        for skill_name, level, xp in skills:
+            self.skills.setdefault(skill_name, len(self.skills))
+        self._skills_csv.writerows((profile_id, skill_name, level, xp) for skill_name, level, xp in skills)
+        for item_id, _ in inventory:
+            self.items.setdefault(item_id, len(self.items))
+        self._inventory_csv.writerows((profile_id, item_id, quantity) for item_id, quantity in inventory)
+        self.inventory_entries += len(inventory)
+        self.rows += 1
+
+    def close(self):
+        for f in self._files:
+            f.close()
+
+
+EXPORT_FORMATS = {
+    "npy": NpyExportWriter,
+    "csv": CsvExportWriter,
+}
+
+
+def export_profiles(paths, out_dir, export_format="npy", workers=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Streams every profile under paths (save files, directories of them, or profile archives)
+    into columnar files in out_dir. Returns an ExportResult.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{export_format}'; expected one of: {', '.join(EXPORT_FORMATS)}.")
+    skipped = []
+    writer = EXPORT_FORMATS[export_format](out_dir)
+    try:
+        for profile in iter_profiles(paths, workers, batch_size, skipped):
+            writer.write(*profile)
+    finally:
+        writer.close()
+    return ExportResult(writer.rows, list(writer.skills), list(writer.items), writer.inventory_entries, skipped)
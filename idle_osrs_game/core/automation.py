@@ -0,0 +1,205 @@
+import bisect
+import re
+from collections import deque
+
+MAX_ACTIONS_PER_PROCESS = 100 # Guards against rules that keep triggering each other
+# Commands a rule may run: the skill actions of skills.registry.SKILL_ACTIONS plus "stop".
+# Anything else (save, load, exit, ...) would run mid-tick or prompt for input.
+RULE_ACTIONS = ("wc", "mine", "fish", "burn", "stop")
+
+_RULE = re.compile(r"^when\s+(?P<condition>.+?)\s+do\s+(?P<command>.+)$", re.IGNORECASE)
+_LEVEL_CONDITION = re.compile(r"^level\s+(?P<skill>[a-z]+)\s*>=\s*(?P<threshold>\d+)$", re.IGNORECASE)
+_ITEM_CONDITION = re.compile(r"^(?P<item>[a-z_][a-z_ ]*?)\s*(?P<op>>=|<=)\s*(?P<threshold>\d+)$", re.IGNORECASE)
+_FIRE_CONDITION = re.compile(r"^fire\s+out(?:\s+(?P<log>[a-z_ ]+))?$", re.IGNORECASE)
+
+
+def _item_id(name):
+    return "_".join(name.lower().split())
+
+
+class Rule:
+    """One automation rule: run command when condition becomes true.
+    kind is "item" (inventory count crosses threshold in direction op), "level"
+    (skill reaches threshold) or "fire" (a fire burns out; key None matches any log).
+    """
+
+    def __init__(self, rule_id, kind, key, command, op=None, threshold=None):
+        self.rule_id = rule_id
+        self.kind = kind
+        self.key = key
+        self.command = command
+        self.op = op
+        self.threshold = threshold
+
+    @property
+    def condition(self):
+        if self.kind == "level":
+            return f"level {self.key} >= {self.threshold}"
+        if self.kind == "item":
+            return f"{self.key} {self.op} {self.threshold}"
+        return f"fire out {self.key}" if self.key else "fire out"
+
+    @property
+    def text(self):
+        return f"when {self.condition} do {self.command}"
+
+
+def parse_rule(text, rule_id=None):
+    """Parses "when <condition> do <command>". Conditions:
+    "<item> >= N" / "<item> <= N", "level <skill> >= N", "fire out [<log>]".
+    The command must be a skill command (see RULE_ACTIONS).
+    Raises ValueError if text is not a valid rule.
+    """
+    match = _RULE.match(text.strip())
+    if not match:
+        raise ValueError("Rules look like: when <condition> do <command>")
+    condition = match.group("condition").strip()
+    command = " ".join(match.group("command").split())
+    if command.split()[0].lower() not in RULE_ACTIONS:
+        raise ValueError(f"Rules can only run skill commands ({', '.join(RULE_ACTIONS)}).")
+
+    level = _LEVEL_CONDITION.match(condition)
+    if level:
+        return Rule(rule_id, "level", level.group("skill").capitalize(), command, ">=", int(level.group("threshold")))
+    fire = _FIRE_CONDITION.match(condition)
+    if fire:
+        return Rule(rule_id, "fire", _item_id(fire.group("log")) if fire.group("log") else None, command)
+    item = _ITEM_CONDITION.match(condition)
+    if item:
+        return Rule(rule_id, "item", _item_id(item.group("item")), command, item.group("op"), int(item.group("threshold")))
+    raise ValueError(f"Unknown condition '{condition}'. Use '<item> >= N', '<item> <= N', "
+                     "'level <skill> >= N' or 'fire out [<log>]'.")
+
+
+class _ThresholdIndex:
+    """Rules on one counter (an item's quantity or a skill's level), sorted by threshold.
+    A change from old to new finds the rules it crosses by bisection, so the cost is
+    O(log n + matches) however many rules watch the same counter.
+    """
+
+    def __init__(self):
+        self._rising = ([], []) # (thresholds, rules) for ">=": fire when old < threshold <= new
+        self._falling = ([], []) # (thresholds, rules) for "<=": fire when new <= threshold < old
+
+    def _side(self, rule):
+        return self._rising if rule.op == ">=" else self._falling
+
+    def add(self, rule):
+        thresholds, rules = self._side(rule)
+        i = bisect.bisect_right(thresholds, rule.threshold)
+        thresholds.insert(i, rule.threshold)
+        rules.insert(i, rule)
+
+    def remove(self, rule):
+        thresholds, rules = self._side(rule)
+        i = rules.index(rule)
+        del thresholds[i]
+        del rules[i]
+
+    def __len__(self):
+        return len(self._rising[0]) + len(self._falling[0])
+
+    def crossed(self, old, new):
+        if new > old:
+            thresholds, rules = self._rising
+            return rules[bisect.bisect_right(thresholds, old):bisect.bisect_right(thresholds, new)]
+        if new < old:
+            thresholds, rules = self._falling
+            return rules[bisect.bisect_left(thresholds, new):bisect.bisect_left(thresholds, old)]
+        return []
+
+
+class AutomationEngine:
+    """Per-player rules that queue commands in response to game events.
+    Rules are indexed by the item, skill or log they watch, so an event only looks at the
+    rules that can match it. Triggered commands are queued rather than run inside the
+    event (which may fire mid-update) and are run by process() through dispatch.
+    """
+
+    def __init__(self, events, dispatch=None):
+        self.dispatch = dispatch # Callable taking a command string, set by whoever runs the game
+        self.rules = {} # rule_id -> Rule
+        self._next_id = 1
+        self._item_rules = {} # item_id -> _ThresholdIndex
+        self._level_rules = {} # skill_name -> _ThresholdIndex
+        self._fire_rules = {} # log_id (or None for any log) -> list of rules
+        self._pending = deque()
+        events.subscribe("inventory_changed", self._on_inventory_changed)
+        events.subscribe("level_up", self._on_level_up)
+        events.subscribe("fire_burned_out", self._on_fire_burned_out)
+
+    def add_rule(self, text):
+        """Parses and adds a rule. Returns the Rule; raises ValueError if text is invalid."""
+        rule = parse_rule(text, self._next_id)
+        self._next_id += 1
+        self.rules[rule.rule_id] = rule
+        if rule.kind == "item":
+            self._item_rules.setdefault(rule.key, _ThresholdIndex()).add(rule)
+        elif rule.kind == "level":
+            self._level_rules.setdefault(rule.key, _ThresholdIndex()).add(rule)
+        else:
+            self._fire_rules.setdefault(rule.key, []).append(rule)
+        return rule
+
+    def remove_rule(self, rule_id):
+        """Removes a rule by id. Returns True if it existed."""
+        rule = self.rules.pop(rule_id, None)
+        if rule is None:
+            return False
+        if rule.kind == "fire":
+            self._fire_rules[rule.key].remove(rule)
+        else:
+            index = (self._item_rules if rule.kind == "item" else self._level_rules)[rule.key]
+            index.remove(rule)
+        return True
+
+    def clear(self):
+        for rule_id in list(self.rules):
+            self.remove_rule(rule_id)
+        self._pending.clear()
+
+    def to_list(self):
+        """Rule texts in creation order, for saving."""
+        return [rule.text for rule in self.rules.values()]
+
+    def load_rules(self, rule_texts):
+        """Replaces all rules with rule_texts (as produced by to_list), skipping invalid ones."""
+        self.clear()
+        for text in rule_texts:
+            try:
+                if not isinstance(text, str):
+                    raise ValueError("not a rule string")
+                self.add_rule(text)
+            except ValueError as e:
+                print(f"Skipping invalid automation rule '{text}': {e}")
+
+    @property
+    def has_pending(self):
+        return bool(self._pending)
+
+    def process(self):
+        """Runs queued commands through dispatch. Call once per game tick."""
+        if self.dispatch is None:
+            return
+        for _ in range(min(len(self._pending), MAX_ACTIONS_PER_PROCESS)):
+            self.dispatch(self._pending.popleft())
+
+    def _queue(self, rules):
+        for rule in rules:
+            self._pending.append(rule.command)
+
+    def _on_inventory_changed(self, item_id, old_quantity, new_quantity, refund):
+        if refund:
+            return # Items handed back by a stop must not restart what the player just stopped
+        index = self._item_rules.get(item_id)
+        if index:
+            self._queue(index.crossed(old_quantity, new_quantity))
+
+    def _on_level_up(self, skill_name, old_level, new_level):
+        index = self._level_rules.get(skill_name)
+        if index:
+            self._queue(index.crossed(old_level, new_level))
+
+    def _on_fire_burned_out(self, log_id):
+        self._queue(self._fire_rules.get(log_id, ()))
+        self._queue(self._fire_rules.get(None, ()))
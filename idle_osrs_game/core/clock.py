@@ -0,0 +1,25 @@
+TICK_SECONDS = 0.1 # Length of one game logic update
+
+
+class GameClock:
+    """Fixed-step game time used by the skill managers in place of time.time().
+    Time only moves when tick() is called, so the same commands applied on the same
+    ticks always produce the same game state, whether ticks follow the wall clock
+    (the console game) or run as fast as possible (replays and simulations).
+    """
+
+    def __init__(self, start=0.0, tick_seconds=TICK_SECONDS):
+        self.start = start
+        self.tick_seconds = tick_seconds
+        self.ticks = 0
+
+    def __call__(self):
+        # Derived from the tick count rather than accumulated, so it never drifts
+        return self.start + self.ticks * self.tick_seconds
+
+    def tick(self, count=1):
+        self.ticks += count
+
+    def ticks_until(self, timestamp):
+        """Number of whole ticks between now and timestamp (0 if it is not in the future)."""
+        return max(0, int((timestamp - self.start) / self.tick_seconds + 1e-9) - self.ticks)
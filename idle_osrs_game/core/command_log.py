@@ -0,0 +1,144 @@
+import contextlib
+import copy
+import os
+import time
+
+from .clock import GameClock
+from .player import Player
+from .simulation import Simulation
+
+COMMAND_LOG_VERSION = 1
+XP_TOLERANCE = 1e-6 # XP is a float sum; allow for rounding when comparing replayed state
+
+
+def snapshot_player(player):
+    """Returns a JSON-serializable copy of the player state a replay has to reproduce."""
+    return {
+        "skills": copy.deepcopy(player.skills),
+        "inventory": dict(player.inventory),
+        "rng": player.get_rng_state()
+    }
+
+
+def restore_player(player, snapshot):
+    """Loads a snapshot_player() result into player."""
+    player.skills = copy.deepcopy(snapshot["skills"])
+    player.inventory = dict(snapshot["inventory"])
+    player.set_rng_state(snapshot["rng"])
+
+
+def compare_snapshots(expected, actual):
+    """Returns a list of human-readable differences between two player snapshots."""
+    mismatches = []
+    for skill_name in sorted(set(expected["skills"]) | set(actual["skills"])):
+        want = expected["skills"].get(skill_name, {"level": 1, "xp": 0})
+        got = actual["skills"].get(skill_name, {"level": 1, "xp": 0})
+        if want["level"] != got["level"] or abs(want["xp"] - got["xp"]) > XP_TOLERANCE:
+            mismatches.append(f"{skill_name}: expected level {want['level']} ({want['xp']} XP), "
+                              f"got level {got['level']} ({got['xp']} XP)")
+    for item_id in sorted(set(expected["inventory"]) | set(actual["inventory"])):
+        want = expected["inventory"].get(item_id, 0)
+        got = actual["inventory"].get(item_id, 0)
+        if want != got:
+            mismatches.append(f"{item_id}: expected {want}, got {got}")
+    if expected["rng"] != actual["rng"]:
+        mismatches.append(f"RNG state: expected {expected['rng']}, got {actual['rng']}")
+    return mismatches
+
+
+class CommandLog:
+    """Record of a play session: the starting state, every skill command with the game
+    tick it ran on, and the state at the tick the log was finished.
+    """
+
+    def __init__(self, initial_state, clock_start, tick_seconds, start_tick=0):
+        self.initial_state = initial_state
+        self.clock_start = clock_start
+        self.tick_seconds = tick_seconds
+        self.start_tick = start_tick
+        self.commands = [] # [tick, command] pairs, relative to start_tick
+        self.final_tick = None
+        self.final_state = None
+
+    @classmethod
+    def start(cls, player, clock):
+        """Starts recording player's session from the current tick of clock."""
+        return cls(snapshot_player(player), clock.start, clock.tick_seconds, clock.ticks)
+
+    def record(self, tick, command_str):
+        self.commands.append([tick - self.start_tick, command_str])
+
+    def finish(self, tick, player):
+        """Marks the end of the session, capturing the state a replay must match."""
+        self.final_tick = tick - self.start_tick
+        self.final_state = snapshot_player(player)
+
+    def to_dict(self):
+        return {
+            "version": COMMAND_LOG_VERSION,
+            "clock_start": self.clock_start,
+            "tick_seconds": self.tick_seconds,
+            "start_tick": self.start_tick,
+            "initial_state": self.initial_state,
+            "commands": self.commands,
+            "final_tick": self.final_tick,
+            "final_state": self.final_state
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != COMMAND_LOG_VERSION:
+            raise ValueError(f"Unsupported command log version {data.get('version')}.")
+        log = cls(data["initial_state"], data["clock_start"], data["tick_seconds"], data.get("start_tick", 0))
+        log.commands = [list(entry) for entry in data["commands"]]
+        log.final_tick = data.get("final_tick")
+        log.final_state = data.get("final_state")
+        return log
+
+
+class ReplayResult:
+    def __init__(self, final_state, mismatches, simulated_seconds, wall_seconds):
+        self.final_state = final_state
+        self.mismatches = mismatches # Empty if the replay reproduced the recorded final state
+        self.simulated_seconds = simulated_seconds
+        self.wall_seconds = wall_seconds
+
+    @property
+    def matches(self):
+        return not self.mismatches
+
+
+def replay_command_log(command_log, create_managers, resolver, skill_actions, quiet=True, expected_state=None):
+    """Re-runs command_log against a GameClock as fast as possible.
+    create_managers(player, clock) builds the skill managers (see skills.registry).
+    The replayed state is compared with expected_state (a snapshot_player()-shaped dict,
+    e.g. from the save file) if given, otherwise with the log's own recorded final state.
+    With quiet=True, the game's console messages are discarded.
+    """
+    wall_started = time.perf_counter()
+    clock = GameClock(command_log.clock_start, command_log.tick_seconds)
+    clock.tick(command_log.start_tick)
+    player = Player()
+    restore_player(player, command_log.initial_state)
+    simulation = Simulation(player, create_managers, resolver, skill_actions, clock)
+
+    end_tick = command_log.final_tick
+    if end_tick is None:
+        end_tick = command_log.commands[-1][0] if command_log.commands else 0
+
+    with contextlib.ExitStack() as stack:
+        if quiet:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        for command_tick, command_str in command_log.commands + [[end_tick, None]]:
+            simulation.advance(command_log.start_tick + command_tick - clock.ticks)
+            if command_str is not None:
+                simulation.run_command(command_str)
+
+    final_state = snapshot_player(player)
+    if expected_state is None:
+        expected_state = command_log.final_state
+    mismatches = []
+    if expected_state is not None:
+        mismatches = compare_snapshots(expected_state, final_state)
+    return ReplayResult(final_state, mismatches, end_tick * command_log.tick_seconds,
+                        time.perf_counter() - wall_started)
@@ -0,0 +1,169 @@
+import re
+
+
+def normalize_name(name):
+    """Canonical lookup form of a name: lowercase, underscores as spaces, single-spaced.
+    "Oak Tree", "oak  tree" and "oak_tree" all normalize to "oak tree".
+    """
+    return " ".join(name.lower().replace("_", " ").split())
+
+
+def display_name(key):
+    """Human-readable form of a data table key, e.g. "normal_log" -> "Normal Log"."""
+    return key.replace("_", " ").title()
+
+
+class _TrieNode:
+    __slots__ = ("children", "key", "unique_key", "size")
+
+    def __init__(self):
+        self.children = {}
+        self.key = None         # Data table key if a name ends at this node
+        self.unique_key = None  # The only key in this subtree, or None if there are several
+        self.size = 0           # Number of names ending in this subtree
+
+
+class NameIndex:
+    """Prefix tree over the names of one data table (e.g. TREES).
+    Each node remembers whether a single key lies beneath it, so exact and unambiguous
+    prefix lookups cost O(len(text)) regardless of how many names are indexed.
+    """
+
+    def __init__(self, table, format_names=True):
+        self._root = _TrieNode()
+        self.names = {}  # key -> display name
+        for key in table:
+            self.names[key] = display_name(key) if format_names and key == key.lower() else key
+            self._insert(normalize_name(key), key)
+
+    def _insert(self, name, key):
+        node = self._root
+        path = [node]
+        for char in name:
+            node = node.children.setdefault(char, _TrieNode())
+            path.append(node)
+        if node.key is not None:
+            return  # Two keys normalizing to the same name; the first one wins
+        node.key = key
+        for visited in path:
+            visited.size += 1
+            visited.unique_key = key if visited.size == 1 else None
+
+    def _find(self, name):
+        node = self._root
+        for char in name:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def resolve(self, text):
+        """Returns the key named by text, either exactly or by an unambiguous prefix.
+        Returns None if text matches nothing or more than one name.
+        """
+        node = self._find(normalize_name(text))
+        if node is None:
+            return None
+        if node.key is not None:
+            return node.key
+        return node.unique_key
+
+    def complete(self, prefix, limit=None):
+        """Returns the display names starting with prefix, in alphabetical order."""
+        node = self._find(normalize_name(prefix))
+        if node is None:
+            return []
+        return [self.names[key] for key in self._keys_under(node, limit)]
+
+    def _keys_under(self, node, limit=None):
+        """Keys in node's subtree, in alphabetical order of their names."""
+        keys = []
+        stack = [node]
+        while stack and (limit is None or len(keys) < limit):
+            current = stack.pop()
+            if current.key is not None:
+                keys.append(current.key)
+            stack.extend(current.children[char] for char in sorted(current.children, reverse=True))
+        return keys
+
+    def suggest(self, text, max_distance=2, limit=3):
+        """Returns up to limit display names within max_distance edits of text or of one of
+        their prefixes (so a mistyped abbreviation like "oka" still finds "Oak Tree"), closest first.
+        The edit-distance rows are shared along trie paths and branches are pruned as soon as
+        every entry in their row exceeds max_distance.
+        """
+        name = normalize_name(text)
+        max_distance = min(max_distance, max(1, len(name) // 2)) # Two edits fit almost any 3-letter prefix
+        first_row = list(range(len(name) + 1))
+        matches = [] # (distance, -depth, node): text is within distance edits of node's prefix
+
+        def visit(node, char, previous_row, depth):
+            row = [previous_row[0] + 1]
+            for i in range(1, len(name) + 1):
+                cost = 0 if name[i - 1] == char else 1
+                row.append(min(row[i - 1] + 1, previous_row[i] + 1, previous_row[i - 1] + cost))
+            if row[-1] <= max_distance:
+                matches.append((row[-1], -depth, id(node), node))
+            if min(row) <= max_distance:
+                for next_char, child in node.children.items():
+                    visit(child, next_char, row, depth + 1)
+
+        for char, child in self._root.children.items():
+            visit(child, char, first_row, 1)
+        matches.sort() # Closest first; among equals, the longest (most specific) prefix first
+        keys = []
+        for _, _, _, node in matches:
+            for key in self._keys_under(node, limit):
+                if key not in keys:
+                    keys.append(key)
+            if len(keys) >= limit:
+                break
+        return [self.names[key] for key in keys[:limit]]
+
+
+_QUANTITY_PREFIX = re.compile(r"(all|\d+)\s+", re.IGNORECASE) # "all " or "10 " before a quantity action's argument
+
+
+class CommandResolver:
+    """Resolves command actions and their arguments against the game's data tables.
+    Built once at startup from {action: table}, e.g. {"wc": TREES, "burn": LOG_FIRE_DATA}.
+    Extra actions that take no data-table argument (stop, save, ...) can be listed in plain_actions
+    so that they are offered by complete(). Actions listed in quantity_actions accept a leading
+    count or "all" before their argument (e.g. "burn 10 oak log").
+    """
+
+    def __init__(self, action_tables, plain_actions=(), quantity_actions=()):
+        self.indexes = {action: NameIndex(table) for action, table in action_tables.items()}
+        self.actions = NameIndex(list(action_tables) + list(plain_actions), format_names=False)
+        self.quantity_actions = frozenset(quantity_actions)
+
+    def resolve(self, action, text):
+        """Resolves an argument for action.
+        Returns (key, suggestions): key is the data table key, or None with a list of
+        candidate display names (prefix completions if ambiguous, near misses otherwise).
+        """
+        index = self.indexes[action]
+        key = index.resolve(text)
+        if key is not None:
+            return key, []
+        suggestions = index.complete(text, limit=5) if text.strip() else []
+        if not suggestions:
+            suggestions = index.suggest(text)
+        return None, suggestions
+
+    def complete(self, line):
+        """Returns full-line completions for a partially typed command, for tab completion."""
+        parts = line.split(" ", 1)
+        if len(parts) == 1:
+            return [action + " " for action in self.actions.complete(parts[0])]
+        index = self.indexes.get(parts[0].lower())
+        if index is None:
+            return []
+        typed = parts[0]
+        argument = parts[1]
+        if parts[0].lower() in self.quantity_actions:
+            quantity = _QUANTITY_PREFIX.match(argument)
+            if quantity:
+                typed += " " + quantity.group(1)
+                argument = argument[quantity.end():]
+        return [f"{typed} {name}" for name in index.complete(argument)]
@@ -0,0 +1,22 @@
+class EventBus:
+    """Minimal publish/subscribe hub for game events.
+    Events in use:
+      "level_up"          skill_name, old_level, new_level
+      "inventory_changed" item_id, old_quantity, new_quantity, refund (True for items returned by a stop)
+      "fire_burned_out"   log_id
+    """
+
+    def __init__(self):
+        self._subscribers = {} # event_type -> list of callbacks
+
+    def subscribe(self, event_type, callback):
+        self._subscribers.setdefault(event_type, []).append(callback)
+
+    def unsubscribe(self, event_type, callback):
+        callbacks = self._subscribers.get(event_type)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+    def emit(self, event_type, **data):
+        for callback in self._subscribers.get(event_type, ()):
+            callback(**data)
@@ -1,44 +1,73 @@
 import json
 import os
 from .player import Player # Assuming Player class is in player.py
+from .profile_archive import ProfileArchive, write_archive
 
 SAVE_FILE_DIR = "idle_osrs_game/data"
 SAVE_FILE_PATH = os.path.join(SAVE_FILE_DIR, "savegame.json")
+ARCHIVE_FILE_PATH = os.path.join(SAVE_FILE_DIR, "profiles.rspa")
+COMMAND_LOG_PATH = os.path.join(SAVE_FILE_DIR, "commandlog.json")
+DEFAULT_PROFILE_ID = "default"
 
 def ensure_save_dir_exists():
     """Ensures the save directory exists."""
     if not os.path.exists(SAVE_FILE_DIR):
         os.makedirs(SAVE_FILE_DIR)
 
-def save_game(player):
-    """Saves the player's game state to a file."""
-    ensure_save_dir_exists()
+def save_game(player, path=None):
+    """Saves the player's game state to a file (the default save file unless path is given)."""
+    if path is None:
+        ensure_save_dir_exists()
+        path = SAVE_FILE_PATH
     data_to_save = {
         "skills": player.skills,
-        "inventory": player.inventory
+        "inventory": player.inventory,
+        "rng": player.get_rng_state(),
+        "automation": player.automation.to_list(),
+        "xp_history": player.xp_history.to_dict()
     }
     try:
-        with open(SAVE_FILE_PATH, 'w') as f:
+        with open(path, 'w') as f:
             json.dump(data_to_save, f, indent=4)
         print("Game saved successfully!")
     except IOError as e:
         print(f"Error saving game: {e}")
 
-def load_game(player_instance):
-    """Loads the player's game state from a file.
+def _load_section(description, load, reset):
+    """Runs load(); if the save's data for it is malformed, prints a notice and runs reset()
+    instead, so one bad optional section doesn't stop the rest of the save from loading.
+    """
+    try:
+        load()
+    except (KeyError, TypeError, ValueError, AttributeError, OverflowError) as e:
+        print(f"Ignoring invalid {description} in save file: {e!r}")
+        reset()
+
+def load_game(player_instance, path=None):
+    """Loads the player's game state from a file (the default save file unless path is given).
     Modifies the provided player_instance directly.
     Returns True if load was successful, False otherwise.
     """
-    if not os.path.exists(SAVE_FILE_PATH):
+    if path is None:
+        path = SAVE_FILE_PATH
+    if not os.path.exists(path):
         print("No save file found. Starting a new game.")
         return False
 
     try:
-        with open(SAVE_FILE_PATH, 'r') as f:
+        with open(path, 'r') as f:
             loaded_data = json.load(f)
 
         player_instance.skills = loaded_data.get("skills", {})
         player_instance.inventory = loaded_data.get("inventory", {}) # Load inventory
+        if "rng" in loaded_data: # Older saves keep the freshly generated seed
+            fresh_rng_state = player_instance.get_rng_state()
+            _load_section("RNG state", lambda: player_instance.set_rng_state(loaded_data["rng"]),
+                          lambda: player_instance.set_rng_state(fresh_rng_state))
+        _load_section("automation rules", lambda: player_instance.automation.load_rules(loaded_data.get("automation", [])),
+                      player_instance.automation.clear)
+        _load_section("XP history", lambda: player_instance.xp_history.load_dict(loaded_data.get("xp_history", {})),
+                      lambda: player_instance.xp_history.load_dict({}))
 
         # Ensure default structure for skills if loading older save or partial data
         for skill_name, skill_data in player_instance.skills.items():
@@ -49,34 +78,107 @@ def load_game(player_instance):
 
         print("Game loaded successfully!")
         return True
-    except (IOError, json.JSONDecodeError) as e:
-        print(f"Error loading game: {e}. Starting a new game.")
+    except (IOError, ValueError, KeyError, TypeError, AttributeError) as e: # ValueError covers JSONDecodeError
+        print(f"Error loading game: {e!r}. Starting a new game.")
         # Reset player to a default state if load fails
         player_instance.skills = {} # Or re-initialize as new
         # player_instance.inventory = [] # Commented out as inventory is a dict
         return False
 
-def initialize_player_from_load(player):
+def read_save_profile(path):
+    """Returns {"skills": ..., "inventory": ...} from a save file without building a Player,
+    or None if the file is JSON but not a save. Raises IOError or ValueError if it can't be read.
+    Used by bulk tools (e.g. the analytics export) that only need the profile data.
+    """
+    with open(path, 'r') as f:
+        loaded_data = json.load(f)
+    if not isinstance(loaded_data, dict) or not isinstance(loaded_data.get("skills"), dict):
+        return None
+    return {
+        "skills": loaded_data["skills"],
+        "inventory": loaded_data.get("inventory") or {}
+    }
+
+def save_command_log(command_log, path=COMMAND_LOG_PATH):
+    """Saves a finished CommandLog so the session can be replayed later."""
+    ensure_save_dir_exists()
+    try:
+        with open(path, 'w') as f:
+            json.dump(command_log.to_dict(), f)
+        print("Command log saved.")
+    except IOError as e:
+        print(f"Error saving command log: {e}")
+
+def export_to_archive(player, profile_id=DEFAULT_PROFILE_ID, archive_path=ARCHIVE_FILE_PATH):
+    """Writes the player's save data into the profile archive under profile_id.
+    Other profiles already in the archive are kept; an existing entry for profile_id is replaced.
+    Returns True if the export was successful, False otherwise.
+    """
+    ensure_save_dir_exists()
+    profile = {
+        "skills": player.skills,
+        "inventory": player.inventory
+    }
+    try:
+        profiles = []
+        if os.path.exists(archive_path):
+            with ProfileArchive(archive_path) as archive:
+                profiles = [(pid, data) for pid, data in archive.iter_profiles() if pid != profile_id]
+        profiles.append((profile_id, profile))
+        write_archive(archive_path, profiles)
+        print(f"Exported profile '{profile_id}' to archive.")
+        return True
+    except (IOError, ValueError) as e:
+        print(f"Error exporting to archive: {e}")
+        return False
+
+def import_from_archive(player_instance, profile_id=DEFAULT_PROFILE_ID, archive_path=ARCHIVE_FILE_PATH):
+    """Loads profile_id from the profile archive into player_instance.
+    Returns True if the import was successful, False otherwise (the player is left unchanged).
+    """
+    if not os.path.exists(archive_path):
+        print("No profile archive found.")
+        return False
+
+    try:
+        with ProfileArchive(archive_path) as archive:
+            profile = archive.get_profile(profile_id)
+    except (IOError, ValueError) as e:
+        print(f"Error reading archive: {e}")
+        return False
+
+    if profile is None:
+        print(f"Profile '{profile_id}' not found in archive.")
+        return False
+
+    player_instance.skills = profile["skills"]
+    player_instance.inventory = profile["inventory"]
+    print(f"Imported profile '{profile_id}' from archive.")
+    return True
+
+def initialize_new_player(player):
+    """Gives player the empty inventory and level 1 skills of a new game."""
+    player.inventory = {} # Ensure inventory is an empty dict for new game
+    # Merged default_skills
+    default_skills = {
+        "Woodcutting": {"level": 1, "xp": 0},
+        "Mining": {"level": 1, "xp": 0},
+        "Fishing": {"level": 1, "xp": 0},
+        "Firemaking": {"level": 1, "xp": 0}
+    }
+    for skill_name, defaults in default_skills.items():
+        if skill_name not in player.skills:
+             player.skills[skill_name] = defaults.copy()
+
+def initialize_player_from_load(player, path=None):
     """Wrapper to load game data into an existing player object."""
-    if not load_game(player): # load_game returns True on success, False on failure/no file
+    if not load_game(player, path): # load_game returns True on success, False on failure/no file
         # If load failed or no save file, ensure default skills and inventory are initialized
-        player.inventory = {} # Ensure inventory is an empty dict for new game
-        # Merged default_skills
-        default_skills = {
-            "Woodcutting": {"level": 1, "xp": 0},
-            "Mining": {"level": 1, "xp": 0},
-            "Fishing": {"level": 1, "xp": 0},
-            "Firemaking": {"level": 1, "xp": 0}
-        }
-        for skill_name, defaults in default_skills.items():
-            if skill_name not in player.skills:
-                 player.skills[skill_name] = defaults.copy()
+        initialize_new_player(player)
     else:
         # If load was successful, ensure all expected skills are present,
         # and inventory is correctly a dict.
-        # Using the inventory check from feature/inventory-and-mining-skill
-        player_instance_dict = player.__dict__
-        if "inventory" not in player_instance_dict or not isinstance(player_instance_dict["inventory"], dict):
+        if not isinstance(player.inventory, dict):
             player.inventory = {} # Initialize if missing or wrong type
 
         # Merged default_skills
@@ -99,6 +201,7 @@ def initialize_player_from_load(player):
     # Ensure inventory is initialized if somehow missed (e.g. very old save)
     if not hasattr(player, 'inventory') or player.inventory is None:
         player.inventory = {}
+    player.invalidate_derived_stats() # Skills were patched in place above
 
 
     # Recalculate levels based on XP if necessary, or ensure consistency.
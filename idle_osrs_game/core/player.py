@@ -1,24 +1,86 @@
+import functools
+import random
+import time
+
+from .automation import AutomationEngine
+from .events import EventBus
+from .rng import SeededRandom, derive_seed
+from .xp_history import XpHistory
+
+
+@functools.lru_cache(maxsize=None)
+def format_item_name(item_id):
+    """Display form of an item id, e.g. "oak_log" -> "Oak Log" (memoized; item ids are few)."""
+    return item_id.replace('_', ' ').title()
+
+
 class Player:
     def __init__(self):
+        # Derived values (totals, display strings) computed on first read and kept until
+        # add_xp or an inventory mutator changes what they depend on. Must exist before
+        # skills/inventory are assigned, as their setters clear it.
+        self._skill_cache = {}
+        self._inventory_cache = {}
         self.skills = {}  # Stores skill levels and XP: {"Woodcutting": {"level": 1, "xp": 0}}
         self.inventory = {} # Stores items: {"item_id": quantity}
         self.active_skill = None
+        self.rng_seed = random.getrandbits(64) # Saved with the profile so sessions can be replayed
+        self.rng_streams = {} # Per-skill SeededRandom streams, created on first use
+        self.events = EventBus() # level_up / inventory_changed / fire_burned_out notifications
+        self.automation = AutomationEngine(self.events) # Player-defined "when ... do ..." rules
+        self.xp_history = XpHistory() # Bounded per-skill XP-over-time buckets
+        self.clock = time.time # Timestamps XP history; the game shares its GameClock
+
+    @property
+    def skills(self):
+        return self._skills
+
+    @skills.setter
+    def skills(self, skills):
+        self._skills = skills
+        self._skill_cache.clear()
+
+    @property
+    def inventory(self):
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, inventory):
+        self._inventory = inventory
+        self._inventory_cache.clear()
 
-    def add_item_to_inventory(self, item_id, quantity=1):
-        """Adds items to the player's inventory."""
+    def invalidate_derived_stats(self):
+        """Drops cached totals and display strings. Only needed after editing skills or
+        inventory in place without add_xp or the inventory methods (e.g. when patching a loaded save).
+        """
+        self._skill_cache.clear()
+        self._inventory_cache.clear()
+
+    def add_item_to_inventory(self, item_id, quantity=1, refund=False):
+        """Adds items to the player's inventory.
+        refund=True marks items handed back from a cancelled action; automation ignores those.
+        """
+        self._inventory_cache.clear()
+        old_quantity = self.inventory.get(item_id, 0)
         if item_id in self.inventory:
             self.inventory[item_id] += quantity
         else:
             self.inventory[item_id] = quantity
         print(f"Added {quantity}x {item_id} to inventory.")
+        self.events.emit("inventory_changed", item_id=item_id, old_quantity=old_quantity, new_quantity=self.inventory[item_id],
+                         refund=refund)
 
     def remove_item_from_inventory(self, item_id, quantity=1):
         """Removes items from the player's inventory. Returns True if successful."""
         if item_id in self.inventory and self.inventory[item_id] >= quantity:
+            self._inventory_cache.clear()
+            old_quantity = self.inventory[item_id]
             self.inventory[item_id] -= quantity
             if self.inventory[item_id] == 0:
                 del self.inventory[item_id]
             print(f"Removed {quantity}x {item_id} from inventory.")
+            self.events.emit("inventory_changed", item_id=item_id, old_quantity=old_quantity, new_quantity=old_quantity - quantity,
+                             refund=False)
             return True
         else:
             print(f"Could not remove {quantity}x {item_id}. Item not found or insufficient quantity.")
@@ -26,11 +88,15 @@ class Player:
 
     def get_inventory_display(self):
         """Returns a string representation of the inventory."""
-        if not self.inventory:
-            return "Inventory: Empty"
-
-        items_str = ", ".join([f"{item_id.replace('_', ' ').title()}: {qty}" for item_id, qty in self.inventory.items()])
-        return f"Inventory: {items_str}"
+        display = self._inventory_cache.get("display")
+        if display is None:
+            if not self.inventory:
+                display = "Inventory: Empty"
+            else:
+                items_str = ", ".join([f"{format_item_name(item_id)}: {qty}" for item_id, qty in self.inventory.items()])
+                display = f"Inventory: {items_str}"
+            self._inventory_cache["display"] = display
+        return display
 
     def get_skill_level(self, skill_name):
         return self.skills.get(skill_name, {}).get("level", 1)
@@ -38,22 +104,78 @@ class Player:
     def get_skill_xp(self, skill_name):
         return self.skills.get(skill_name, {}).get("xp", 0)
 
+    def get_total_level(self):
+        total = self._skill_cache.get("total_level")
+        if total is None:
+            total = self._skill_cache["total_level"] = sum(self.get_skill_level(name) for name in self.skills)
+        return total
+
+    def get_total_xp(self):
+        total = self._skill_cache.get("total_xp")
+        if total is None:
+            total = self._skill_cache["total_xp"] = sum(self.get_skill_xp(name) for name in self.skills)
+        return total
+
+    def get_skill_progress(self, skill_name):
+        """Returns "Skill: Level L (XP: x/needed)" for skill_name."""
+        key = ("progress", skill_name)
+        line = self._skill_cache.get(key)
+        if line is None:
+            level = self.get_skill_level(skill_name)
+            line = f"{skill_name}: Level {level} (XP: {self.get_skill_xp(skill_name)}/{self.xp_for_next_level(level)})"
+            self._skill_cache[key] = line
+        return line
+
+    def get_skills_display(self):
+        """Returns the progress line of every skill, in skill order."""
+        lines = self._skill_cache.get("skills_display")
+        if lines is None:
+            lines = self._skill_cache["skills_display"] = tuple(self.get_skill_progress(name) for name in self.skills)
+        return lines
+
     def add_xp(self, skill_name, xp_amount):
         if skill_name not in self.skills:
             self.skills[skill_name] = {"level": 1, "xp": 0}
+        # Only this skill's line and the totals depend on it
+        for key in (("progress", skill_name), "total_level", "total_xp", "skills_display"):
+            self._skill_cache.pop(key, None)
 
+        old_level = self.skills[skill_name]["level"]
         self.skills[skill_name]["xp"] += xp_amount
+        self.xp_history.record(skill_name, xp_amount, self.clock())
         # Simple XP to level conversion (example: 100 XP per level)
         # In a real game, this would be a more complex formula
         while self.skills[skill_name]["xp"] >= self.xp_for_next_level(self.skills[skill_name]["level"]):
             self.skills[skill_name]["level"] += 1
             print(f"Congratulations! Your {skill_name} level is now {self.skills[skill_name]['level']}!")
+        if self.skills[skill_name]["level"] != old_level:
+            self.events.emit("level_up", skill_name=skill_name, old_level=old_level, new_level=self.skills[skill_name]["level"])
 
     def xp_for_next_level(self, current_level):
         # Example: level 1 needs 100 XP, level 2 needs 200 XP, etc.
         # This should be replaced with OSRS's actual XP curve eventually.
         return current_level * 100
 
+    def get_rng(self, skill_name):
+        """Returns the player's deterministic random stream for skill_name."""
+        if skill_name not in self.rng_streams:
+            self.rng_streams[skill_name] = SeededRandom(derive_seed(self.rng_seed, skill_name))
+        return self.rng_streams[skill_name]
+
+    def get_rng_state(self):
+        """Returns the seed and per-skill stream positions, for saving."""
+        return {
+            "seed": self.rng_seed,
+            "positions": {skill_name: stream.position for skill_name, stream in self.rng_streams.items()}
+        }
+
+    def set_rng_state(self, rng_state):
+        """Restores state produced by get_rng_state."""
+        self.rng_seed = rng_state["seed"]
+        self.rng_streams = {}
+        for skill_name, position in rng_state.get("positions", {}).items():
+            self.get_rng(skill_name).position = position
+
     def set_active_skill(self, skill_name):
         self.active_skill = skill_name
 
@@ -0,0 +1,276 @@
+import mmap
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; column() falls back to a memoryview-backed sequence
+    np = None
+
+# Archive layout (all integers little-endian):
+#   header        ARCHIVE_MAGIC, version, skill count, item count, record count, record size
+#   name tables   skill names then item ids, each as <u16 length><utf-8 bytes>
+#   padding       up to an 8 byte boundary
+#   records       one fixed-size record per profile:
+#                 <32s profile id><u32 inventory offset><u32 inventory count>
+#                 then (<f64 xp><u32 level>) for every skill, in name table order
+#   inventory     (<u16 item index><u32 quantity>) entries, referenced by the records
+ARCHIVE_MAGIC = b"RSPA"
+ARCHIVE_VERSION = 1
+PROFILE_ID_SIZE = 32
+
+_HEADER = struct.Struct("<4sHHHII")
+_NAME_LEN = struct.Struct("<H")
+_RECORD_PREFIX = struct.Struct("<32sII")
+_SKILL_FIELDS = struct.Struct("<dI")
+_INVENTORY_ENTRY = struct.Struct("<HI")
+
+_MAX_NAMES = 0xFFFF
+_MAX_QUANTITY = 0xFFFFFFFF
+
+
+def _record_struct(skill_count):
+    return struct.Struct(_RECORD_PREFIX.format + "dI" * skill_count)
+
+
+def _encode_profile_id(profile_id):
+    encoded = profile_id.encode("utf-8")
+    if not encoded or len(encoded) > PROFILE_ID_SIZE or b"\x00" in encoded:
+        raise ValueError(f"Invalid profile id {profile_id!r}: must be 1-{PROFILE_ID_SIZE} bytes of UTF-8 without NULs.")
+    return encoded
+
+
+def write_archive(path, profiles):
+    """Writes profiles to a fixed-record archive at path.
+    profiles is an iterable of (profile_id, {"skills": ..., "inventory": ...}) pairs.
+    The file is written next to path and moved into place, so readers never see a partial archive.
+    """
+    profiles = list(profiles)
+
+    skill_names = []
+    item_ids = []
+    seen_skills = set()
+    seen_items = set()
+    seen_profiles = set()
+    for profile_id, profile in profiles:
+        if profile_id in seen_profiles:
+            raise ValueError(f"Duplicate profile id {profile_id!r}.")
+        seen_profiles.add(profile_id)
+        for skill_name in profile.get("skills", {}):
+            if skill_name not in seen_skills:
+                seen_skills.add(skill_name)
+                skill_names.append(skill_name)
+        for item_id in profile.get("inventory", {}):
+            if item_id not in seen_items:
+                seen_items.add(item_id)
+                item_ids.append(item_id)
+
+    if len(skill_names) > _MAX_NAMES or len(item_ids) > _MAX_NAMES:
+        raise ValueError("Too many distinct skills or items for the archive format.")
+
+    skill_index = {name: i for i, name in enumerate(skill_names)}
+    item_index = {item_id: i for i, item_id in enumerate(item_ids)}
+    record = _record_struct(len(skill_names))
+
+    records = bytearray(record.size * len(profiles))
+    inventory = bytearray()
+    inventory_count = 0
+    for row, (profile_id, profile) in enumerate(profiles):
+        skill_values = [0.0, 1] * len(skill_names)
+        for skill_name, skill_data in profile.get("skills", {}).items():
+            i = skill_index[skill_name] * 2
+            xp, level = skill_data.get("xp", 0), skill_data.get("level", 1)
+            if not isinstance(xp, (int, float)) or isinstance(xp, bool):
+                raise ValueError(f"XP {xp!r} of {skill_name!r} is not a number.")
+            if not isinstance(level, int) or isinstance(level, bool) or not 0 <= level <= _MAX_QUANTITY:
+                raise ValueError(f"Level {level!r} of {skill_name!r} does not fit in the archive format.")
+            skill_values[i] = float(xp)
+            skill_values[i + 1] = level
+
+        items = profile.get("inventory", {})
+        first_entry = inventory_count
+        for item_id, quantity in items.items():
+            if not isinstance(quantity, int) or isinstance(quantity, bool) or not 0 <= quantity <= _MAX_QUANTITY:
+                raise ValueError(f"Quantity {quantity} of {item_id!r} does not fit in the archive format.")
+            inventory += _INVENTORY_ENTRY.pack(item_index[item_id], quantity)
+            inventory_count += 1
+
+        record.pack_into(records, row * record.size,
+                         _encode_profile_id(profile_id), first_entry, len(items), *skill_values)
+
+    header = bytearray(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(skill_names), len(item_ids),
+                                    len(profiles), record.size))
+    for name in skill_names + item_ids:
+        encoded = name.encode("utf-8")
+        header += _NAME_LEN.pack(len(encoded)) + encoded
+    # Start the records on an 8-byte boundary. Fields inside a record are packed, so most
+    # XP fields are still unaligned; struct and NumPy's strided views read them either way.
+    header += b"\x00" * (-len(header) % 8)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(records)
+        f.write(inventory)
+    os.replace(tmp_path, path)
+
+
+class _RecordColumn:
+    """Read-only sequence over one field of every record, unpacked on access from the mmap."""
+
+    def __init__(self, view, records_offset, record_size, count, field_format, field_offset):
+        self._view = view
+        self._base = records_offset + field_offset
+        self._stride = record_size
+        self._count = count
+        self._field = struct.Struct("<" + field_format)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("column index out of range")
+        return self._field.unpack_from(self._view, self._base + index * self._stride)[0]
+
+    def __iter__(self):
+        unpack_from = self._field.unpack_from
+        view = self._view
+        for offset in range(self._base, self._base + self._count * self._stride, self._stride):
+            yield unpack_from(view, offset)[0]
+
+
+class ProfileArchive:
+    """Memory-mapped, read-only view of a profile archive written by write_archive.
+    Profiles are looked up by id; whole columns (e.g. every profile's Fishing XP) can be
+    scanned without copying the file. Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"{path} is not a profile archive.")
+        self._view = memoryview(self._mmap)
+        self._index = None
+        try:
+            self._parse_header()
+        except (ValueError, struct.error, UnicodeDecodeError):
+            self.close()
+            raise
+
+    def _parse_header(self):
+        magic, version, skill_count, item_count, self._count, self._record_size = _HEADER.unpack_from(self._view, 0)
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f"{self.path} is not a profile archive.")
+        if version != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported profile archive version {version}.")
+
+        offset = _HEADER.size
+        names = []
+        for _ in range(skill_count + item_count):
+            (length,) = _NAME_LEN.unpack_from(self._view, offset)
+            offset += _NAME_LEN.size
+            names.append(bytes(self._view[offset:offset + length]).decode("utf-8"))
+            offset += length
+        self.skill_names = tuple(names[:skill_count])
+        self.item_ids = tuple(names[skill_count:])
+
+        self._record = _record_struct(skill_count)
+        if self._record.size != self._record_size:
+            raise ValueError(f"Corrupt profile archive {self.path}: unexpected record size.")
+        self._skill_offsets = {name: _RECORD_PREFIX.size + i * _SKILL_FIELDS.size
+                               for i, name in enumerate(self.skill_names)}
+        self._records_offset = offset + (-offset % 8)
+        self._inventory_offset = self._records_offset + self._count * self._record_size
+        if self._inventory_offset > len(self._view):
+            raise ValueError(f"Corrupt profile archive {self.path}: truncated records.")
+        inventory_entries = (len(self._view) - self._inventory_offset) // _INVENTORY_ENTRY.size
+        for offset in range(self._records_offset, self._inventory_offset, self._record_size):
+            _, first_entry, entry_count = _RECORD_PREFIX.unpack_from(self._view, offset)
+            if first_entry + entry_count > inventory_entries:
+                raise ValueError(f"Corrupt profile archive {self.path}: truncated inventory.")
+
+    def close(self):
+        """Releases the mapping. Fails with BufferError while column views are still referenced."""
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+            self._mmap.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, profile_id):
+        return profile_id in self._get_index()
+
+    def profile_ids(self):
+        """Yields profile ids in record order."""
+        start = self._records_offset
+        for offset in range(start, start + self._count * self._record_size, self._record_size):
+            yield bytes(self._view[offset:offset + PROFILE_ID_SIZE]).rstrip(b"\x00").decode("utf-8")
+
+    def _get_index(self):
+        if self._index is None:
+            self._index = {profile_id: row for row, profile_id in enumerate(self.profile_ids())}
+        return self._index
+
+    def _read_record(self, row):
+        values = self._record.unpack_from(self._view, self._records_offset + row * self._record_size)
+        _, first_entry, entry_count = values[:3]
+
+        skills = {}
+        for i, skill_name in enumerate(self.skill_names):
+            xp = values[3 + i * 2]
+            skills[skill_name] = {"level": values[4 + i * 2], "xp": int(xp) if xp.is_integer() else xp}
+
+        inventory = {}
+        offset = self._inventory_offset + first_entry * _INVENTORY_ENTRY.size
+        for item_index, quantity in _INVENTORY_ENTRY.iter_unpack(self._view[offset:offset + entry_count * _INVENTORY_ENTRY.size]):
+            inventory[self.item_ids[item_index]] = quantity
+        return {"skills": skills, "inventory": inventory}
+
+    def get_profile(self, profile_id):
+        """Returns {"skills": ..., "inventory": ...} for profile_id, or None if it is not archived."""
+        row = self._get_index().get(profile_id)
+        if row is None:
+            return None
+        return self._read_record(row)
+
+    def iter_profiles(self):
+        """Yields (profile_id, profile) pairs in record order."""
+        for row, profile_id in enumerate(self.profile_ids()):
+            yield profile_id, self._read_record(row)
+
+    def column(self, skill_name, field="xp"):
+        """Returns every profile's value of field ("xp" or "level") for skill_name, in record order.
+        With NumPy installed this is a strided ndarray over the mapping; otherwise a lazy
+        sequence that unpacks values straight from the mapping. Neither copies the records.
+        """
+        if skill_name not in self._skill_offsets:
+            raise KeyError(f"Skill {skill_name!r} is not in this archive.")
+        if field == "xp":
+            field_format, field_offset = "d", self._skill_offsets[skill_name]
+        elif field == "level":
+            field_format, field_offset = "I", self._skill_offsets[skill_name] + 8
+        else:
+            raise ValueError(f"Unknown column field {field!r}; expected 'xp' or 'level'.")
+
+        if np is not None:
+            return np.ndarray(shape=(self._count,), dtype="<" + ("f8" if field == "xp" else "u4"),
+                              buffer=self._view, offset=self._records_offset + field_offset,
+                              strides=(self._record_size,))
+        return _RecordColumn(self._view, self._records_offset, self._record_size, self._count,
+                             field_format, field_offset)
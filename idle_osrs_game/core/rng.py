@@ -0,0 +1,36 @@
+import zlib
+
+_MASK64 = (1 << 64) - 1
+
+
+def _splitmix64(value):
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def derive_seed(player_seed, stream_name):
+    """Seed for one named stream (e.g. a skill) of a player, stable across runs and platforms."""
+    return _splitmix64((player_seed ^ (zlib.crc32(stream_name.encode("utf-8")) << 32)) & _MASK64)
+
+
+class SeededRandom:
+    """Deterministic random stream whose whole state is (seed, position).
+    The n-th draw is a pure function of seed and n, so a saved stream resumes in O(1)
+    and produces the same values regardless of Python version.
+    """
+
+    def __init__(self, seed, position=0):
+        self.seed = seed & _MASK64
+        self.position = position
+
+    def random(self):
+        """Returns the next float in [0.0, 1.0)."""
+        value = _splitmix64((self.seed + self.position * 0xD1B54A32D192ED03) & _MASK64)
+        self.position += 1
+        return (value >> 11) * (1.0 / (1 << 53))
+
+    def uniform(self, a, b):
+        """Returns the next float in [a, b), like random.uniform."""
+        return a + (b - a) * self.random()
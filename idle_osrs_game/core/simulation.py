@@ -0,0 +1,57 @@
+import time
+
+from .clock import GameClock
+from .skill_commands import run_skill_command
+
+# Ticks before a manager's next action that are still stepped one by one. Skipping stops
+# short of the action so float rounding in the managers' own time checks can't move it.
+FAST_FORWARD_MARGIN = 2
+
+
+class Simulation:
+    """Drives a player's skill managers on a GameClock without the console UI.
+    Ticks follow the same rules as the live game loop (tick, then update the active
+    skill's manager), but runs of ticks on which no manager would act are skipped.
+    """
+
+    def __init__(self, player, create_managers, resolver, skill_actions, clock=None):
+        self.player = player
+        # Default to starting now: the player's XP history is keyed by these timestamps
+        self.clock = clock if clock is not None else GameClock(start=time.time())
+        player.clock = self.clock
+        self.managers = create_managers(player, self.clock)
+        self.resolver = resolver
+        self.skill_actions = skill_actions
+        player.automation.dispatch = self.run_command
+
+    def run_command(self, command_str):
+        """Runs a skill command on the current tick. Returns False if it is not a skill command."""
+        return run_skill_command(command_str, self.player, self.managers, self.resolver, self.skill_actions)
+
+    def advance(self, ticks, until=None):
+        """Advances the clock by ticks, updating the active manager as the game loop would.
+        If until is given, it is checked after every manager action and stops the run early.
+        Returns True if stopped by until, False if all ticks were run.
+        """
+        automation = self.player.automation
+        end_tick = self.clock.ticks + ticks
+        while self.clock.ticks < end_tick:
+            manager = self.managers.get(self.player.active_skill) if self.player.active_skill else None
+            next_action_at = manager.next_action_at() if manager else None
+            if not automation.has_pending:
+                if next_action_at is None:
+                    self.clock.tick(end_tick - self.clock.ticks) # Nothing will happen; jump to the end
+                    break
+
+                skip = min(self.clock.ticks_until(next_action_at) - FAST_FORWARD_MARGIN, end_tick - self.clock.ticks)
+                if skip > 0:
+                    self.clock.tick(skip)
+                    continue
+
+            self.clock.tick()
+            if manager:
+                manager.update()
+            automation.process() # Triggered rules run after the tick's update, as in the game loop
+            if until is not None and until():
+                return True
+        return False
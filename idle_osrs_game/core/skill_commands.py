@@ -0,0 +1,79 @@
+def stop_all_actions(player, managers):
+    """Stops whatever the player's active skill manager is doing."""
+    if player.active_skill:
+        active_manager = managers.get(player.active_skill)
+        if active_manager:
+            # Generic stop method if possible, or skill-specific
+            if hasattr(active_manager, 'stop_action'): # Ideal generic method
+                active_manager.stop_action()
+            elif hasattr(active_manager, 'stop_cutting'): # Woodcutting
+                active_manager.stop_cutting()
+            elif hasattr(active_manager, 'stop_mining'): # Mining
+                active_manager.stop_mining()
+            elif hasattr(active_manager, 'stop_fishing'): # Fishing
+                active_manager.stop_fishing()
+            elif hasattr(active_manager, 'stop_burning'): # Firemaking
+                active_manager.stop_burning()
+        player.clear_active_skill()
+
+
+def is_skill_command(action, skill_actions):
+    """True for commands that change what the player is doing (and so belong in a command log)."""
+    return action == "stop" or action in skill_actions
+
+
+def run_skill_command(command_str, player, managers, resolver, skill_actions):
+    """Runs a skill command ("wc oak", "burn normal log", "stop", ...).
+    skill_actions maps actions to their skill, data table and start method (see skills.registry).
+    Returns False if command_str is not a skill command, True otherwise.
+    """
+    parts = command_str.lower().split()
+    if not parts or not is_skill_command(parts[0], skill_actions):
+        return False
+    action = parts[0]
+
+    if action == "stop":
+        if player.active_skill:
+            stop_all_actions(player, managers)
+        else:
+            print("Not doing anything.")
+        return True
+
+    spec = skill_actions[action]
+    manager = managers.get(spec["skill"])
+    if not manager:
+        return False
+    if len(parts) == 1:
+        print(f"Usage: {spec['usage']}")
+        return True
+
+    subcommands = spec.get("subcommands", {})
+    if len(parts) == 2 and parts[1] in subcommands:
+        getattr(manager, subcommands[parts[1]])()
+        return True
+
+    arguments = parts[1:]
+    quantity = 1
+    if spec.get("quantity") and len(arguments) > 1:
+        if arguments[0] == "all":
+            quantity = None
+            arguments = arguments[1:]
+        elif arguments[0].isdigit():
+            quantity = int(arguments[0])
+            arguments = arguments[1:]
+
+    # Case-insensitive exact or unambiguous-prefix lookup, e.g. "wc oak" -> "Oak Tree"
+    argument = " ".join(arguments)
+    key, suggestions = resolver.resolve(action, argument)
+    if key is None:
+        hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+        print(f"Unknown {spec['kind']}: '{argument}'.{hint}")
+        return True
+
+    if not (spec.get("queues") and player.active_skill == spec["skill"]):
+        stop_all_actions(player, managers)
+    if spec.get("quantity"):
+        getattr(manager, spec["start"])(key, quantity)
+    else:
+        getattr(manager, spec["start"])(key)
+    return True
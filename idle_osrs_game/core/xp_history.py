@@ -0,0 +1,105 @@
+from array import array
+
+# (name, bucket width in seconds, bucket count): one day of minutes, one week of hours,
+# one year of days. Memory per skill is fixed at sum(count) * 12 bytes, about 23 KiB.
+RESOLUTIONS = (
+    ("minute", 60, 1440),
+    ("hour", 3600, 168),
+    ("day", 86400, 365),
+)
+
+
+class _RingBuffer:
+    """Fixed-size ring of XP sums. Slot i holds bucket number epochs[i] (timestamp // width);
+    a slot whose epoch doesn't match the bucket being asked for is stale and counts as zero,
+    so old data never has to be cleared explicitly.
+    """
+
+    def __init__(self, width, count):
+        self.width = width
+        self.count = count
+        self.epochs = array("i", [-1]) * count
+        self.values = array("d", [0.0]) * count
+
+    def add(self, timestamp, amount):
+        epoch = int(timestamp // self.width)
+        i = epoch % self.count
+        if self.epochs[i] != epoch:
+            self.epochs[i] = epoch
+            self.values[i] = 0.0
+        self.values[i] += amount
+
+    def get(self, epoch):
+        i = epoch % self.count
+        return self.values[i] if self.epochs[i] == epoch else 0.0
+
+    def to_list(self):
+        """Non-empty buckets as [epoch, xp] pairs."""
+        return [[epoch, value] for epoch, value in zip(self.epochs, self.values) if epoch >= 0 and value]
+
+    def load_list(self, buckets):
+        for epoch, value in buckets:
+            i = epoch % self.count
+            if epoch > self.epochs[i]: # Keep the newest bucket if two map to the same slot
+                self.epochs[i] = epoch
+                self.values[i] = value
+
+
+class XpHistory:
+    """Round-robin XP-over-time store, one set of ring buffers per skill.
+    Recording is O(number of resolutions) and queries are O(buckets read); memory does not
+    grow with session length because each resolution keeps a fixed number of buckets.
+    """
+
+    def __init__(self):
+        self._skills = {} # skill_name -> {resolution name: _RingBuffer}, allocated on first XP
+
+    def _buffers(self, skill_name):
+        if skill_name not in self._skills:
+            self._skills[skill_name] = {name: _RingBuffer(width, count) for name, width, count in RESOLUTIONS}
+        return self._skills[skill_name]
+
+    def record(self, skill_name, xp_amount, timestamp):
+        for buffer in self._buffers(skill_name).values():
+            buffer.add(timestamp, xp_amount)
+
+    def gained(self, skill_name, seconds, now):
+        """XP gained in skill_name over roughly the last `seconds`, to the resolution of the
+        finest buffer that spans the whole window (the current, partial bucket included).
+        """
+        buffers = self._skills.get(skill_name)
+        if not buffers:
+            return 0
+        buffer = next((buffers[name] for name, width, count in RESOLUTIONS if seconds <= width * count),
+                      buffers[RESOLUTIONS[-1][0]])
+        current = int(now // buffer.width)
+        buckets = min(buffer.count, max(1, -(-int(seconds) // buffer.width)))
+        return sum(buffer.get(epoch) for epoch in range(current - buckets + 1, current + 1))
+
+    def series(self, skill_name, resolution, count, now):
+        """The last count buckets at resolution ("minute", "hour" or "day"), oldest first,
+        as (bucket start timestamp, xp) pairs, for graphs.
+        """
+        sizes = {name: (width, size) for name, width, size in RESOLUTIONS}
+        if resolution not in sizes:
+            raise ValueError(f"Unknown resolution '{resolution}'.")
+        width, size = sizes[resolution]
+        count = min(count, size)
+        current = int(now // width)
+        buffer = self._skills.get(skill_name, {}).get(resolution)
+        return [(epoch * width, buffer.get(epoch) if buffer else 0.0)
+                for epoch in range(current - count + 1, current + 1)]
+
+    def to_dict(self):
+        """Sparse, JSON-serializable form for saving."""
+        return {skill_name: {name: buffer.to_list() for name, buffer in buffers.items()}
+                for skill_name, buffers in self._skills.items()}
+
+    def load_dict(self, data):
+        """Replaces the history with data produced by to_dict."""
+        self._skills = {}
+        for skill_name, resolutions in data.items():
+            buffers = self._buffers(skill_name)
+            for name, buckets in resolutions.items():
+                if name in buffers:
+                    buffers[name].load_list(buckets)
@@ -0,0 +1,46 @@
+# Bulk export of saved profiles into columnar files for analytics.
+# Usage (from the repository root):
+#   python -m idle_osrs_game.export saves/ idle_osrs_game/data/profiles.rspa --out export/
+import argparse
+import sys
+import time
+
+from .core.analytics_export import DEFAULT_BATCH_SIZE, EXPORT_FORMATS, export_profiles
+from .core.game_io import SAVE_FILE_DIR
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m idle_osrs_game.export",
+                                     description="Stream save files and profile archives into columnar files.")
+    parser.add_argument("paths", nargs="*", default=[SAVE_FILE_DIR],
+                        help=f"save files, directories of them, or .rspa archives (default: {SAVE_FILE_DIR})")
+    parser.add_argument("--out", required=True, help="directory to write the export to")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="npy",
+                        help="npy: .npy columns and a sparse inventory .npz (default); csv: long-form CSV")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes parsing save files (default: one per CPU; 1 parses in this process)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"save files per worker task (default: {DEFAULT_BATCH_SIZE})")
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1.")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1.")
+
+    started = time.perf_counter()
+    result = export_profiles(args.paths, args.out, args.format, args.workers, args.batch_size)
+    seconds = time.perf_counter() - started
+
+    print(f"Exported {result.profiles} profiles ({len(result.skills)} skills, {len(result.items)} items, "
+          f"{result.inventory_entries} inventory entries) to {args.out} in {seconds:.2f}s")
+    if result.skipped:
+        print(f"Skipped {len(result.skipped)} files:")
+        for reason in result.skipped[:20]:
+            print(f"  {reason}")
+        if len(result.skipped) > 20:
+            print(f"  ... and {len(result.skipped) - 20} more")
+    return 1 if result.skipped else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,37 @@
 # Main entry point for the game.
+# Usage: python main.py [--script commands.txt]
+import argparse
 import time
 import os # Import os for screen clearing
 from core.player import Player
-from core.game_io import save_game, initialize_player_from_load
-from skills.woodcutting import Woodcutting, TREES
-from skills.mining import Mining, ROCKS
-from skills.fishing import Fishing, FISH_DATA # Assuming FISH_DATA exists in fishing.py
-from skills.firemaking import Firemaking, LOG_FIRE_DATA # Assuming LOG_FIRE_DATA exists in firemaking.py
+from core.game_io import save_game, save_command_log, initialize_player_from_load
+from core.clock import GameClock
+from core.command_log import CommandLog
+from core.command_resolver import CommandResolver, display_name
+from core.skill_commands import is_skill_command, run_skill_command
+from skills.registry import ACTION_TABLES, SKILL_ACTIONS, create_skill_managers
+from skills.tables import SKILL_TABLES, load_tables
+
+try:
+    import readline # Optional: enables tab completion of commands where available
+except ImportError:
+    readline = None
 
 # Global game state
 game_state = {
     "running": True,
     "last_update": time.time(),
+    "clock": GameClock(start=time.time()), # Game time, advanced in fixed ticks by update_game_state
     "player": Player(),
-    "active_managers": {} # To store skill managers
+    "active_managers": {}, # To store skill managers
+    "command_log": None # Skill commands of this session, for replays
 }
 
+# Name index for command arguments, built once from the data tables.
+# Powers handle_command lookups, tab completion and scripted command batches.
+COMMAND_RESOLVER = CommandResolver(ACTION_TABLES, plain_actions=("stop", "auto", "xp", "best", "save", "load", "exit"),
+                                   quantity_actions=[action for action, spec in SKILL_ACTIONS.items() if spec.get("quantity")])
+
 def initialize_game():
     """Initializes the game state, player, skills, etc."""
     player = game_state["player"]
@@ -41,16 +57,17 @@ def initialize_game():
                 player.skills[skill_name]["level"] = defaults["level"]
             if "xp" not in player.skills[skill_name]:
                 player.skills[skill_name]["xp"] = defaults["xp"]
+    player.invalidate_derived_stats() # Skills may have been patched in place above
 
     # Setup skill managers
-    game_state["active_managers"]["Woodcutting"] = Woodcutting(player)
-    game_state["active_managers"]["Mining"] = Mining(player)
-    game_state["active_managers"]["Fishing"] = Fishing(player) # Add Fishing manager
-    game_state["active_managers"]["Firemaking"] = Firemaking(player) # Add Firemaking manager
+    game_state["active_managers"] = create_skill_managers(player, game_state["clock"])
+    game_state["command_log"] = CommandLog.start(player, game_state["clock"])
+    player.automation.dispatch = handle_command # Rule commands run (and are logged) like typed ones
+    player.clock = game_state["clock"]
 
     print("Game ready.")
     # Update available commands string if new commands are added for Fishing/Firemaking
-    print("Try commands: 'wc <tree>', 'mine <rock>', 'fish <spot>', 'burn <log>', 'stop', 'save', 'load', 'exit'")
+    print("Try commands: 'wc <tree>', 'mine <rock>', 'fish <spot>', 'burn <log>', 'stop', 'auto', 'xp', 'best', 'save', 'load', 'exit'")
 
 
 def process_input():
@@ -64,15 +81,21 @@ def process_input():
 
 
 def update_game_state():
-    """Updates the game state."""
+    """Updates the game state.
+    Runs one fixed-length tick per elapsed GameClock step, so game time catches up
+    after long pauses (e.g. while waiting for input) and sessions replay exactly.
+    """
     current_time = time.time()
-    delta_time = current_time - game_state["last_update"]
     game_state["last_update"] = current_time
 
-    if game_state["player"].active_skill:
-        skill_name = game_state["player"].active_skill
-        if skill_name in game_state["active_managers"]:
-            game_state["active_managers"][skill_name].update()
+    clock = game_state["clock"]
+    for _ in range(clock.ticks_until(current_time)):
+        clock.tick()
+        if game_state["player"].active_skill:
+            skill_name = game_state["player"].active_skill
+            if skill_name in game_state["active_managers"]:
+                game_state["active_managers"][skill_name].update()
+        game_state["player"].automation.process() # Commands queued by automation rules this tick
 
 
 def render_ui():
@@ -89,11 +112,9 @@ def render_ui():
     print("="*30)
 
     print("\n--- Skills ---")
-    for skill_name in player.skills.keys():
-        level = player.get_skill_level(skill_name)
-        xp = player.get_skill_xp(skill_name)
-        xp_needed_for_next = player.xp_for_next_level(level) # Assuming xp_for_next_level is robust
-        print(f"{skill_name}: Level {level} (XP: {xp}/{xp_needed_for_next})")
+    for skill_line in player.get_skills_display(): # Cached on the player until XP changes
+        print(skill_line)
+    print(f"Total level: {player.get_total_level()} (Total XP: {player.get_total_xp()})")
 
     print("\n--- Inventory ---")
     print(player.get_inventory_display())
@@ -110,8 +131,8 @@ def render_ui():
                     action_verb = "Chopping"
                     depleted_at = manager.tree_depleted_at
                     current_activity_details = f"{action_verb} {item_name}"
-                    if time.time() < depleted_at:
-                        respawn_in = depleted_at - time.time()
+                    if game_state["clock"]() < depleted_at:
+                        respawn_in = depleted_at - game_state["clock"]()
                         current_activity_details += f" (Depleted, respawns in {respawn_in:.1f}s)"
             elif player.active_skill == "Mining":
                 if hasattr(manager, 'is_mining') and manager.is_mining and manager.current_rock:
@@ -119,8 +140,8 @@ def render_ui():
                     action_verb = "Mining"
                     depleted_at = manager.rock_depleted_at
                     current_activity_details = f"{action_verb} {item_name}"
-                    if time.time() < depleted_at:
-                        respawn_in = depleted_at - time.time()
+                    if game_state["clock"]() < depleted_at:
+                        respawn_in = depleted_at - game_state["clock"]()
                         current_activity_details += f" (Depleted, respawns in {respawn_in:.1f}s)"
 
             elif player.active_skill == "Fishing":
@@ -135,28 +156,17 @@ def render_ui():
                     action_verb = "Burning"
                     current_activity_details = f"{action_verb} {item_name}"
                     if hasattr(manager, 'fire_ends_at') and manager.fire_ends_at > 0:
-                        remaining_time = manager.fire_ends_at - time.time()
+                        remaining_time = manager.fire_ends_at - game_state["clock"]()
                         if remaining_time > 0:
                             current_activity_details += f" (ends in {remaining_time:.0f}s)"
                         else:
-                            current_activity_details += " (ending)
-                            
-            elif player.active_skill == "Fishing": # Example for Fishing
-                if hasattr(manager, 'is_fishing') and manager.is_fishing and manager.current_spot:
-                    item_name = manager.current_spot
-                    action_verb = "Fishing at"
-                    # Fishing spots might not "deplete" in the same way, or have different mechanics
-                    current_activity_details = f"{action_verb} {item_name}"
-            elif player.active_skill == "Firemaking": # Example for Firemaking
-                 if hasattr(manager, 'is_burning') and manager.is_burning and manager.current_log:
-                    item_name = manager.current_log
-                    action_verb = "Burning"
-                    current_activity_details = f"{action_verb} {item_name}"
- main
+                            current_activity_details += " (ending)"
+                    if manager.burn_queue:
+                        current_activity_details += f" [{manager.queued_count} logs queued]"
 
         print(f"Current: {player.active_skill} - {current_activity_details}")
     else:
-        print("Current: Idle. Available commands: wc <tree>, mine <rock>, fish <spot>, burn <log>, stop, save, load, exit")
+        print("Current: Idle. Available commands: wc <tree>, mine <rock>, fish <spot>, burn <log>, stop, auto, xp, best, save, load, exit")
 
     print("="*30 + "\n")
 
@@ -170,104 +180,138 @@ def handle_command(command_str):
     action = parts[0]
     player = game_state["player"]
 
-    # Make managers easily accessible
-    wc_manager = game_state["active_managers"].get("Woodcutting")
-    mining_manager = game_state["active_managers"].get("Mining")
-    fishing_manager = game_state["active_managers"].get("Fishing")
-    firemaking_manager = game_state["active_managers"].get("Firemaking")
-
-
-    def stop_all_actions():
-        if player.active_skill:
-            active_manager = game_state["active_managers"].get(player.active_skill)
-            if active_manager:
-                # Generic stop method if possible, or skill-specific
-                if hasattr(active_manager, 'stop_action'): # Ideal generic method
-                    active_manager.stop_action()
-                elif hasattr(active_manager, 'stop_cutting'): # Woodcutting
-                    active_manager.stop_cutting()
-                elif hasattr(active_manager, 'stop_mining'): # Mining
-                    active_manager.stop_mining()
-                elif hasattr(active_manager, 'stop_fishing'): # Fishing
-                    active_manager.stop_fishing()
-                elif hasattr(active_manager, 'stop_burning'): # Firemaking
-                    active_manager.stop_burning()
-            player.clear_active_skill()
-            # print("Stopped current action.") # Usually printed by manager's stop method
-
-    if action == "wc" and wc_manager:
-        if len(parts) > 1:
-            tree_name_parts = [p.capitalize() for p in parts[1:]]
-            tree_name = " ".join(tree_name_parts)
-            if tree_name in TREES:
-                stop_all_actions()
-                wc_manager.start_cutting(tree_name)
-            else:
-                print(f"Unknown tree: '{tree_name}'. Available: {', '.join(TREES.keys())}")
-        else:
-            print("Usage: wc <tree name> (e.g., wc Normal Tree)")
-    elif action == "mine" and mining_manager:
-        if len(parts) > 1:
-            rock_name_parts = [p.capitalize() for p in parts[1:]]
-            rock_name = " ".join(rock_name_parts)
-            if rock_name in ROCKS:
-                stop_all_actions()
-                mining_manager.start_mining(rock_name)
-            else:
-                print(f"Unknown rock: '{rock_name}'. Available: {', '.join(ROCKS.keys())}")
-        else:
-            print("Usage: mine <rock name> (e.g., mine Copper Ore)")
-    elif action == "fish" and fishing_manager: # Add fish command
-        if len(parts) > 1:
-            spot_name_parts = [p.capitalize() for p in parts[1:]]
-            spot_name = " ".join(spot_name_parts)
-            if spot_name in FISH_DATA: # Assumes FISH_DATA is the dict of fishing spots
-                stop_all_actions()
-                fishing_manager.start_fishing(spot_name)
-            else:
-                print(f"Unknown fishing spot: '{spot_name}'. Available: {', '.join(FISH_DATA.keys())}")
-        else:
-            print("Usage: fish <spot name> (e.g., fish Shrimp Spot)")
-    elif action == "burn" and firemaking_manager: # Add burn command
-        if len(parts) > 1:
-            log_name_parts = [p.capitalize() for p in parts[1:]] # Or parts[1] if log names are single words
-            log_name = " ".join(log_name_parts) # e.g. "Normal Log"
-            # We need to check if the log_name is valid (e.g. exists in LOG_FIRE_DATA or player inventory)
-            # For simplicity, let's assume LOG_FIRE_DATA contains burnable logs
-            if log_name.lower() in LOG_FIRE_DATA: # Check against defined burnable logs (e.g. "normal_log")
-                stop_all_actions()
-                firemaking_manager.start_burning(log_name.lower()) # Pass the ID-like key
-            else:
-                print(f"Cannot burn '{log_name}'. Available logs to burn: {', '.join(LOG_FIRE_DATA.keys())}")
-        else:
-            print("Usage: burn <log name> (e.g., burn Normal Log)")
+    managers = game_state["active_managers"]
 
-    elif action == "stop":
-        if player.active_skill:
-            stop_all_actions()
-        else:
-            print("Not doing anything.")
+    if is_skill_command(action, SKILL_ACTIONS):
+        game_state["command_log"].record(game_state["clock"].ticks, command_str)
+        if run_skill_command(command_str, player, managers, COMMAND_RESOLVER, SKILL_ACTIONS):
+            return
+
+    if action == "auto":
+        handle_automation_command(parts[1:])
+    elif action == "xp":
+        show_xp_history()
+    elif action == "best":
+        show_best_activities()
     elif action == "save":
-        save_game(player)
+        save_game_and_log()
     elif action == "load":
-        stop_all_actions()
+        stop_player_logged()
         initialize_player_from_load(player)
         # Re-initialize all managers as player data might have changed
-        game_state["active_managers"]["Woodcutting"] = Woodcutting(player)
-        game_state["active_managers"]["Mining"] = Mining(player)
-        game_state["active_managers"]["Fishing"] = Fishing(player)
-        game_state["active_managers"]["Firemaking"] = Firemaking(player)
+        game_state["active_managers"] = create_skill_managers(player, game_state["clock"])
+        game_state["command_log"] = CommandLog.start(player, game_state["clock"])
         print("Attempted to load game. Check messages for status.")
 
     elif action == "exit":
-        stop_all_actions()
+        stop_player_logged()
         save_choice = input("Save before exiting? (yes/no): ").lower()
         if save_choice == 'yes' or save_choice == 'y':
-            save_game(game_state["player"])
+            save_game_and_log()
         game_state["running"] = False
         print("Exiting game...")
     else:
-        print(f"Unknown command: {action}. Available: wc, mine, fish, burn, stop, save, load, exit")
+        print(f"Unknown command: {action}. Available: wc, mine, fish, burn, stop, auto, xp, best, save, load, exit")
+
+
+def stop_player_logged():
+    """Stops the active skill through a recorded "stop" command, so a replay of the command
+    log sees the same side effects (e.g. queued logs returned to the inventory).
+    """
+    if game_state["player"].active_skill:
+        handle_command("stop")
+
+
+def show_xp_history():
+    """Prints XP gained per skill over the last hour, day and week."""
+    player = game_state["player"]
+    now = game_state["clock"]()
+    print("XP gained (last hour / day / week):")
+    for skill_name in player.skills:
+        hour, day, week = (player.xp_history.gained(skill_name, seconds, now) for seconds in (3600, 86400, 7 * 86400))
+        print(f"  {skill_name}: {hour:g} / {day:g} / {week:g}")
+
+
+def show_best_activities():
+    """Prints the highest XP-per-second activity each skill has unlocked."""
+    player = game_state["player"]
+    tables = load_tables()
+    print("Best XP rate at your current levels:")
+    for skill_name in SKILL_TABLES:
+        best = tables.best_activity(skill_name, player.get_skill_level(skill_name))
+        print(f"  {skill_name}: {display_name(best) if best else 'nothing unlocked'}")
+
+
+def handle_automation_command(args):
+    """Handles 'auto' (list rules), 'auto when <condition> do <command>',
+    'auto remove <id>' and 'auto clear'.
+    """
+    automation = game_state["player"].automation
+    if not args:
+        if not automation.rules:
+            print("No automation rules. Add one with: auto when <condition> do <command>")
+        for rule in automation.rules.values():
+            print(f"[{rule.rule_id}] {rule.text}")
+    elif args[0] == "when":
+        rule_text = " ".join(args)
+        try:
+            rule = automation.add_rule(rule_text)
+        except ValueError as e:
+            print(f"Invalid rule: {e}")
+            return
+        print(f"Added rule [{rule.rule_id}]: {rule.text}")
+    elif args[0] == "remove" and len(args) == 2 and args[1].isdigit():
+        if automation.remove_rule(int(args[1])):
+            print(f"Removed rule [{args[1]}].")
+        else:
+            print(f"No rule with id {args[1]}.")
+    elif args[0] == "clear":
+        automation.clear()
+        print("Removed all automation rules.")
+    else:
+        print("Usage: auto | auto when <condition> do <command> | auto remove <id> | auto clear")
+
+
+def save_game_and_log():
+    """Saves the player and the command log of the session so far."""
+    player = game_state["player"]
+    save_game(player)
+    game_state["command_log"].finish(game_state["clock"].ticks, player)
+    save_command_log(game_state["command_log"])
+
+
+def handle_command_batch(commands):
+    """Runs a scripted batch of commands in order.
+    Accepts an iterable of lines (e.g. an open file); each line may hold several commands
+    separated by ';'. Blank lines and lines starting with '#' are skipped.
+    """
+    for line in commands:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        for command in line.split(";"):
+            if not game_state["running"]:
+                return
+            handle_command(command)
+
+
+def setup_tab_completion():
+    """Hooks COMMAND_RESOLVER into readline so Tab completes actions and names."""
+    if readline is None:
+        return
+    matches = []
+
+    def completer(text, state):
+        if state == 0:
+            # Complete against the whole line so multi-word names like "Oak Tree" work
+            line = readline.get_line_buffer()
+            start = len(line) - len(text)
+            matches[:] = [m[start:] for m in COMMAND_RESOLVER.complete(line)]
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(completer)
+    readline.set_completer_delims("")
+    readline.parse_and_bind("tab: complete")
 
 
 def game_loop(): # This function seems to be unused in the current main() structure.
@@ -286,9 +330,22 @@ def game_loop(): # This function seems to be unused in the current main() struct
         # Input handling would be here if this loop was active.
         time.sleep(0.1)
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Idle OSRS console game.")
+    parser.add_argument("--script", metavar="FILE",
+                        help="run the commands in FILE (one per line or ';'-separated) before prompting")
+    args = parser.parse_args(argv)
+
     print("Welcome to Idle OSRS!")
     initialize_game()
+    setup_tab_completion()
+
+    if args.script:
+        try:
+            with open(args.script, 'r') as f:
+                handle_command_batch(f)
+        except IOError as e:
+            print(f"Error reading script: {e}")
 
     last_ui_render_time = time.time()
     last_logic_update_time = time.time()
@@ -315,7 +372,7 @@ def main():
                  if hasattr(active_wc_manager, 'is_cutting') and active_wc_manager.is_cutting and \
                     hasattr(active_wc_manager, 'current_tree') and active_wc_manager.current_tree and \
                     hasattr(active_wc_manager, 'tree_depleted_at') and \
-                    time.time() > active_wc_manager.tree_depleted_at:
+                    game_state["clock"]() > active_wc_manager.tree_depleted_at:
                      prompt_ready = True
 
 
@@ -328,6 +385,7 @@ def main():
 
                     command = input(prompt_message)
                     if command:
+                         update_game_state() # Catch up on the ticks that passed while waiting for input
                          handle_command(command)
                 except EOFError:
                     print("\nEOF received, exiting...")
@@ -0,0 +1,68 @@
+# Replays a recorded command log at full speed and checks it reproduces the save file.
+# Usage (from the repository root):
+#   python -m idle_osrs_game.replay [path/to/commandlog.json] [--save path/to/savegame.json]
+import argparse
+import json
+import sys
+
+from .core.command_log import CommandLog, replay_command_log
+from .core.command_resolver import CommandResolver
+from .core.game_io import COMMAND_LOG_PATH, SAVE_FILE_PATH
+from .skills.registry import ACTION_TABLES, SKILL_ACTIONS, create_skill_managers
+
+
+def read_saved_state(path):
+    """Returns the skills, inventory and RNG state of a save file, shaped like snapshot_player()."""
+    with open(path, 'r') as f:
+        loaded_data = json.load(f)
+    if not isinstance(loaded_data, dict):
+        raise ValueError("not a save file")
+    return {
+        "skills": loaded_data.get("skills", {}),
+        "inventory": loaded_data.get("inventory", {}),
+        "rng": loaded_data.get("rng") # Saves from before seeded RNG can't match
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m idle_osrs_game.replay",
+                                     description="Replay a command log and check it reproduces the save file.")
+    parser.add_argument("log", nargs="?", default=COMMAND_LOG_PATH,
+                        help=f"command log to replay (default: {COMMAND_LOG_PATH})")
+    parser.add_argument("--save", default=SAVE_FILE_PATH,
+                        help=f"save file the replay must reproduce (default: {SAVE_FILE_PATH})")
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.log, 'r') as f:
+            command_log = CommandLog.from_dict(json.load(f))
+    except (IOError, ValueError) as e:
+        print(f"Error reading command log: {e}")
+        return 2
+    try:
+        saved_state = read_saved_state(args.save)
+    except (IOError, ValueError) as e:
+        print(f"Error reading save file: {e}")
+        return 2
+    if command_log.final_tick is None:
+        print("Command log was never finished by a save; nothing to compare.")
+        return 2
+
+    resolver = CommandResolver(ACTION_TABLES)
+    result = replay_command_log(command_log, create_skill_managers, resolver, SKILL_ACTIONS,
+                                expected_state=saved_state)
+
+    speedup = result.simulated_seconds / result.wall_seconds if result.wall_seconds > 0 else float("inf")
+    print(f"Replayed {len(command_log.commands)} commands over {result.simulated_seconds:.1f}s of game time "
+          f"in {result.wall_seconds:.3f}s ({speedup:.0f}x).")
+    if result.matches:
+        print(f"Replayed state matches the skills, inventory and RNG state in {args.save}.")
+        return 0
+    print(f"Replayed state does NOT match {args.save}:")
+    for mismatch in result.mismatches:
+        print(f"  {mismatch}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+# Headless fast-forward simulation of a scripted plan, for balance and capacity checks.
+# Usage (from the repository root):
+#   python -m idle_osrs_game.sim "fish Netting Spot for 10h, then wc Oak Tree to 45"
+import argparse
+import contextlib
+import os
+import re
+import sys
+import time
+
+try:
+    import resource # Unix only; used for the peak memory report
+except ImportError:
+    resource = None
+
+from .core.clock import GameClock
+from .core.command_resolver import CommandResolver
+from .core.game_io import initialize_new_player, initialize_player_from_load, save_game
+from .core.player import Player
+from .core.simulation import Simulation
+from .skills.registry import ACTION_TABLES, SKILL_ACTIONS, create_skill_managers
+
+DEFAULT_MAX_STEP_TIME = "1000h" # Cap for steps that run until a level or until the activity ends
+
+_STEP_SEPARATOR = re.compile(r"\s*(?:,|;|\bthen\b)\s*", re.IGNORECASE)
+_FOR_STEP = re.compile(r"^(?P<command>.+?)\s+for\s+(?P<duration>.+)$", re.IGNORECASE)
+_TO_STEP = re.compile(r"^(?P<command>.+?)\s+to\s+(?:level\s+)?(?P<level>\d+)$", re.IGNORECASE)
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)\s*([dhms])", re.IGNORECASE)
+_DURATION_UNITS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+
+
+def parse_duration(text):
+    """Parses durations like "10h", "1h30m" or "90s" into seconds."""
+    compact = text.replace(" ", "")
+    parts = _DURATION_PART.findall(compact)
+    if not parts or "".join(value + unit for value, unit in parts) != compact:
+        raise ValueError(f"Invalid duration: '{text}' (use e.g. 10h, 1h30m, 90s)")
+    return sum(float(value) * _DURATION_UNITS[unit.lower()] for value, unit in parts)
+
+
+def parse_plan(plan_text):
+    """Splits a plan into steps.
+    Each step is a dict with the skill "command" and one of:
+    "seconds" (run for that long), "level" (run until the skill reaches it), or neither
+    (run until the activity ends by itself, e.g. a fire burning out).
+    """
+    steps = []
+    for step_text in _STEP_SEPARATOR.split(plan_text.strip()):
+        if not step_text:
+            continue
+        match = _FOR_STEP.match(step_text)
+        if match:
+            steps.append({"command": match.group("command"), "seconds": parse_duration(match.group("duration"))})
+            continue
+        match = _TO_STEP.match(step_text)
+        if match:
+            steps.append({"command": match.group("command"), "level": int(match.group("level"))})
+            continue
+        steps.append({"command": step_text})
+    return steps
+
+
+def peak_memory_mib():
+    """Peak resident memory of this process in MiB, or None where it can't be measured."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024 # bytes on macOS, KiB elsewhere
+
+
+def run_plan(simulation, steps, max_step_ticks):
+    """Runs steps in order. Returns a list of problems (empty if every step completed)."""
+    player = simulation.player
+    problems = []
+    for number, step in enumerate(steps, 1):
+        action = step["command"].split()[0].lower()
+        if action not in SKILL_ACTIONS:
+            problems.append(f"Step {number} ('{step['command']}'): not a skill command.")
+            break
+        skill_name = SKILL_ACTIONS[action]["skill"]
+
+        if "level" in step and player.get_skill_level(skill_name) >= step["level"]:
+            continue # Already there
+
+        simulation.run_command(step["command"])
+        if player.active_skill is None:
+            problems.append(f"Step {number} ('{step['command']}') could not start; "
+                            f"run with --verbose to see why.")
+            break
+
+        if "seconds" in step:
+            simulation.advance(round(step["seconds"] / simulation.clock.tick_seconds))
+        elif "level" in step:
+            target = step["level"]
+            reached = simulation.advance(max_step_ticks, until=lambda: player.get_skill_level(skill_name) >= target
+                                         or player.active_skill is None)
+            if player.get_skill_level(skill_name) < target:
+                reason = "activity ended" if reached else "time limit reached"
+                problems.append(f"Step {number} ('{step['command']}'): {reason} at "
+                                f"{skill_name} level {player.get_skill_level(skill_name)}.")
+                break
+        else:
+            if not simulation.advance(max_step_ticks, until=lambda: player.active_skill is None):
+                problems.append(f"Step {number} ('{step['command']}'): still running at the time limit.")
+                break
+    return problems
+
+
+def format_seconds(seconds):
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours}h {minutes:02d}m {seconds:02d}s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m idle_osrs_game.sim",
+                                     description="Fast-forward a scripted plan without the console UI.")
+    parser.add_argument("plan", help='e.g. "fish Netting Spot for 10h, then wc Oak Tree to 45"')
+    parser.add_argument("--profile", help="save file to start from (default: a new level 1 profile)")
+    parser.add_argument("--save", metavar="PATH", help="write the resulting profile to PATH")
+    parser.add_argument("--max-step-time", default=DEFAULT_MAX_STEP_TIME,
+                        help=f"limit for steps without a 'for' duration (default: {DEFAULT_MAX_STEP_TIME})")
+    parser.add_argument("--rule", action="append", default=[],
+                        help='automation rule to add, e.g. "when oak_log >= 100 do burn oak log" (repeatable)')
+    parser.add_argument("--verbose", action="store_true", help="show the game's own messages")
+    args = parser.parse_args(argv)
+
+    try:
+        steps = parse_plan(args.plan)
+        max_step_seconds = parse_duration(args.max_step_time)
+    except ValueError as e:
+        parser.error(str(e))
+    if not steps:
+        parser.error("The plan has no steps.")
+    if args.profile and not os.path.exists(args.profile):
+        parser.error(f"Profile not found: {args.profile}")
+
+    player = Player()
+    if args.profile:
+        initialize_player_from_load(player, args.profile)
+    else:
+        initialize_new_player(player)
+    for rule_text in args.rule:
+        try:
+            player.automation.add_rule(rule_text)
+        except ValueError as e:
+            parser.error(f"Invalid rule '{rule_text}': {e}")
+
+    clock = GameClock(start=time.time()) # Real timestamps, so XP history lands in the right buckets
+    simulation = Simulation(player, create_skill_managers, CommandResolver(ACTION_TABLES), SKILL_ACTIONS, clock)
+
+    wall_started = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        problems = run_plan(simulation, steps, round(max_step_seconds / clock.tick_seconds))
+    wall_seconds = time.perf_counter() - wall_started
+    simulated_seconds = clock() - clock.start
+
+    print(f"Simulated {format_seconds(simulated_seconds)} of game time in {wall_seconds:.3f}s wall time")
+    if wall_seconds > 0:
+        print(f"Throughput: {simulated_seconds / wall_seconds:,.0f} simulated seconds per wall second")
+    peak = peak_memory_mib()
+    print(f"Peak memory: {peak:.1f} MiB" if peak is not None else "Peak memory: unavailable on this platform")
+
+    print("\n--- Skills ---")
+    for skill_name in player.skills:
+        print(f"{skill_name}: Level {player.get_skill_level(skill_name)} (XP: {player.get_skill_xp(skill_name)})")
+    print("\n--- Inventory ---")
+    print(player.get_inventory_display())
+
+    for problem in problems:
+        print(f"\nWarning: {problem}")
+
+    if args.save:
+        save_game(player, args.save)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
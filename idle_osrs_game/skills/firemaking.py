@@ -1,36 +1,37 @@
 import time
+from collections import deque
+
+from .tables import load_tables
 
 # LOG_FIRE_DATA: Maps log_id to its firemaking properties
 # "level_req": Required Firemaking level to burn this log
 # "xp": XP gained from burning this log
 # "duration": How long the fire lasts in seconds
-LOG_FIRE_DATA = {
-    "normal_log": {"level_req": 1, "xp": 40, "duration": 30},
-    "oak_log": {"level_req": 15, "xp": 60, "duration": 45},
-    "willow_log": {"level_req": 30, "xp": 90, "duration": 60},
-    "teak_log": {"level_req": 35, "xp": 105, "duration": 70},
-    "maple_log": {"level_req": 45, "xp": 135, "duration": 90},
-    "mahogany_log": {"level_req": 50, "xp": 157.5, "duration": 100},
-    "yew_log": {"level_req": 60, "xp": 202.5, "duration": 120},
-    # Add more logs like Magic, Redwood as needed
-}
+LOG_FIRE_DATA = load_tables().logs # data/tables/firemaking.json, validated on load
+# Add more logs like Magic, Redwood as needed
 
 class Firemaking:
-    def __init__(self, player):
+    def __init__(self, player, clock=time.time):
         self.player = player
+        self.clock = clock
         self.is_burning = False  # True if currently tending to a fire (though FM is often one-off)
         self.current_log_id = None # The ID of the log currently burning
         self.fire_ends_at = 0    # Timestamp when the current fire will burn out
-
-    def start_burning(self, log_id_param):
+        # Logs already taken from the inventory, lit back-to-back as each fire burns out.
+        # Entries are [log_id, count] so a queue of 10k logs is a single entry.
+        self.burn_queue = deque()
+
+    @property
+    def queued_count(self):
+        return sum(count for _, count in self.burn_queue)
+
+    def start_burning(self, log_id_param, quantity=1):
+        """Lights quantity logs one after another (quantity=None burns every log of that type held).
+        The logs are reserved from the inventory in a single operation. If a fire is already
+        burning they are queued behind it.
+        """
         log_id = log_id_param.lower().replace(" ", "_") # Normalize, e.g. "Normal Log" -> "normal_log"
 
-        if self.is_burning:
-            # For simplicity, one fire at a time by this manager.
-            # Real OSRS allows multiple fires, but that's more complex for an idle game's active skill.
-            print("You are already tending to a fire.")
-            return
-
         if log_id not in LOG_FIRE_DATA:
             print(f"You can't burn '{log_id_param}'. Unknown log type.")
             return
@@ -38,29 +39,75 @@ class Firemaking:
         log_data = LOG_FIRE_DATA[log_id]
 
         if self.player.get_skill_level("Firemaking") < log_data["level_req"]:
-            print(f"You need level {log_data['level_req']} Firemaking to burn {log_id.replace('_', ' ')}.")
+            unlocked = load_tables().unlocked("Firemaking", self.player.get_skill_level("Firemaking"))
+            print(f"You need level {log_data['level_req']} Firemaking to burn {log_id.replace('_', ' ')}. "
+                  f"At your level: {', '.join(name.replace('_', ' ') for name in unlocked)}.")
             return
 
-        # Attempt to remove one log from inventory
-        if not self.player.remove_item_from_inventory(log_id, 1):
+        if quantity is None:
+            quantity = self.player.inventory.get(log_id, 0)
+        if quantity < 1:
             print(f"You don't have any {log_id.replace('_', ' ')} to burn.")
+            sources = load_tables().item_sources(log_id)
+            if sources:
+                print("Get some from: " + ", ".join(f"{resource} ({skill_name})" for skill_name, resource in sources))
             return
 
-        # Successfully removed log, now start fire
-        self.is_burning = True
-        self.current_log_id = log_id
-        self.fire_ends_at = time.time() + log_data["duration"]
+        # Reserve every log up front: one inventory operation however many are burned
+        if not self.player.remove_item_from_inventory(log_id, quantity):
+            print(f"You don't have {quantity} {log_id.replace('_', ' ')} to burn.")
+            return
 
+        self._clear_unattended_fire()
         self.player.set_active_skill("Firemaking") # Set active skill
+
+        if self.is_burning:
+            self._queue_logs(log_id, quantity)
+            print(f"Queued {quantity}x {log_id.replace('_', ' ')}. {self.queued_count} logs waiting to be lit.")
+            return
+
+        # Light the first log now and queue the rest behind it
+        self.is_burning = True
+        self.current_log_id = log_id
+        self.fire_ends_at = self.clock() + log_data["duration"]
         self.player.add_xp("Firemaking", log_data["xp"]) # XP is granted upfront in OSRS
+        if quantity > 1:
+            self._queue_logs(log_id, quantity - 1)
 
         print(f"You light the {self.current_log_id.replace('_', ' ')}. It will burn for {log_data['duration']} seconds.")
+        if self.burn_queue:
+            print(f"{self.queued_count} more will be lit as each fire burns out.")
         # The active skill will be Firemaking, but the player might be free to do other things
         # while the fire burns. For an idle game, we might clear active_skill after starting
         # or let it be cleared by the update when fire ends. Let's clear it after starting.
         # However, the `main.py` structure assumes active_skill is set while something is "managed".
         # So, we'll leave active_skill as "Firemaking" and let update handle its lifecycle.
 
+    def _queue_logs(self, log_id, quantity):
+        if self.burn_queue and self.burn_queue[-1][0] == log_id:
+            self.burn_queue[-1][1] += quantity
+        else:
+            self.burn_queue.append([log_id, quantity])
+
+    def _clear_unattended_fire(self):
+        if self.is_burning and self.clock() >= self.fire_ends_at and not self.burn_queue:
+            # A fire left unattended (Firemaking was not the active skill) has long gone out
+            self.is_burning = False
+            self.current_log_id = None
+            self.fire_ends_at = 0
+
+    def show_queue(self):
+        """Prints the current fire and the logs waiting to be lit."""
+        self._clear_unattended_fire()
+        if not self.is_burning:
+            print("No fire is burning.")
+            return
+        remaining_time = max(0, self.fire_ends_at - self.clock())
+        print(f"Burning {self.current_log_id.replace('_', ' ')} (ends in {remaining_time:.0f}s).")
+        if not self.burn_queue:
+            print("No logs queued.")
+        for log_id, count in self.burn_queue:
+            print(f"  Queued: {count}x {log_id.replace('_', ' ')}")
 
     def stop_burning(self):
         # This might be called if player manually changes action.
@@ -70,22 +117,50 @@ class Firemaking:
             # Don't clear is_burning or fire_ends_at here, as the fire itself is still going.
             # Only clear the player's *focus* on this skill if that's the desired mechanic.
             # For now, clearing active_skill is handled by main loop's stop_all_actions.
-            pass
+            # Logs that were queued but not lit go back to the inventory.
+            while self.burn_queue:
+                log_id, count = self.burn_queue.popleft()
+                self.player.add_item_to_inventory(log_id, count, refund=True)
 
 
+    def next_action_at(self):
+        """Time at which update() will next do something, or None if it never will."""
+        if not self.is_burning:
+            return None
+        return self.fire_ends_at
+
     def update(self):
         if not self.is_burning:
             return
 
-        if time.time() >= self.fire_ends_at:
+        now = self.clock()
+        if now < self.fire_ends_at:
+            # Fire is still burning. UI should reflect this.
+            # No continuous XP or items from Firemaking in basic OSRS style.
+            return
+
+        # One or more fires have burned out since the last update. Light as many queued logs
+        # as would have been lit by now, granting their XP in one batch per log type.
+        while self.burn_queue and now >= self.fire_ends_at:
+            log_id, count = self.burn_queue[0]
+            log_data = LOG_FIRE_DATA[log_id]
+            lit = min(count, int((now - self.fire_ends_at) // log_data["duration"]) + 1)
+            self.fire_ends_at += lit * log_data["duration"]
+            self.current_log_id = log_id
+            if lit == count:
+                self.burn_queue.popleft()
+            else:
+                self.burn_queue[0][1] -= lit
+            self.player.add_xp("Firemaking", log_data["xp"] * lit)
+            print(f"You light {'another' if lit == 1 else lit} {log_id.replace('_', ' ')}. {self.queued_count} left in the queue.")
+
+        if now >= self.fire_ends_at:
             print(f"The {self.current_log_id.replace('_', ' ')} fire has burned out.")
+            log_id = self.current_log_id
             self.is_burning = False
             self.current_log_id = None
             self.fire_ends_at = 0
             # If Firemaking was the active skill, clear it as the managed action is over.
             if self.player.active_skill == "Firemaking":
                 self.player.clear_active_skill()
-        else:
-            # Fire is still burning. UI should reflect this.
-            # No continuous XP or items from Firemaking in basic OSRS style.
-            pass
+            self.player.events.emit("fire_burned_out", log_id=log_id)
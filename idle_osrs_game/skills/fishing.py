@@ -1,36 +1,16 @@
 import time
-import random
 
-# Define fishing spots, fish types, level requirements, XP, and tools.
+from .tables import load_tables
+
+# Fishing spots, fish types, level requirements, XP, and tools.
 # Tools can be simple strings for now. More complex item system could be added later.
-FISH_DATA = {
-    "Netting Spot": { # A common early fishing spot type
-        "level_req": 1,
-        "tool": "Small Fishing Net", # Example tool
-        "xp_per_fish": 10,
-        "fish": [
-            {"id": "shrimp", "name": "Shrimp", "level_req": 1, "chance": 0.7},
-            {"id": "anchovies", "name": "Anchovies", "level_req": 1, "chance": 0.3}
-        ],
-        "action_time": 5 # Time in seconds for one fishing attempt cycle
-    },
-    "Bait Spot": { # Another common fishing spot type
-        "level_req": 5,
-        "tool": "Fishing Rod",
-        "bait": "Fishing Bait", # Example: requires bait
-        "xp_per_fish": 20, # Average XP, could be fish-specific
-        "fish": [
-            {"id": "sardine", "name": "Sardine", "level_req": 5, "chance": 0.5},
-            {"id": "herring", "name": "Herring", "level_req": 10, "chance": 0.5} # Player might catch this less if below level 10
-        ],
-        "action_time": 7
-    },
-    # Add more spots like "Lure Spot", "Cage Spot", "Harpoon Spot" later
-}
+FISH_DATA = load_tables().fish # data/tables/fishing.json, validated on load
+# Add more spots like "Lure Spot", "Cage Spot", "Harpoon Spot" later
 
 class Fishing:
-    def __init__(self, player):
+    def __init__(self, player, clock=time.time):
         self.player = player
+        self.clock = clock
         self.is_fishing = False
         self.current_spot_name = None
         self.current_spot_data = None
@@ -43,7 +23,9 @@ class Fishing:
 
         spot_data = FISH_DATA[spot_name]
         if self.player.get_skill_level("Fishing") < spot_data["level_req"]:
-            print(f"You need level {spot_data['level_req']} Fishing to fish at {spot_name}.")
+            unlocked = load_tables().unlocked("Fishing", self.player.get_skill_level("Fishing"))
+            print(f"You need level {spot_data['level_req']} Fishing to fish at {spot_name}. "
+                  f"At your level: {', '.join(unlocked)}.")
             return
 
         # Basic tool check (assumes tools are just strings for now, not actual inventory items)
@@ -66,7 +48,7 @@ class Fishing:
         self.current_spot_name = spot_name
         self.current_spot_data = spot_data
         self.player.set_active_skill("Fishing")
-        self.last_action_time = time.time() # Start action timer immediately
+        self.last_action_time = self.clock() # Start action timer immediately
         print(f"You start fishing at {self.current_spot_name}...")
 
     def stop_fishing(self):
@@ -77,23 +59,25 @@ class Fishing:
             self.player.clear_active_skill()
             print("You stop fishing.")
 
+    def next_action_at(self):
+        """Time at which update() will next do something, or None if it never will."""
+        if not self.is_fishing or not self.current_spot_data:
+            return None
+        return self.last_action_time + self.current_spot_data["action_time"]
+
     def update(self):
         if not self.is_fishing or not self.current_spot_data:
             return
 
-        current_time = time.time()
+        current_time = self.clock()
         action_time = self.current_spot_data["action_time"]
 
         if current_time - self.last_action_time >= action_time:
             self.last_action_time = current_time # Reset timer for next action
 
-            # Determine which fish can be caught based on player's fishing level
-            possible_fish_to_catch = []
-            total_chance_weight = 0
-            for fish_info in self.current_spot_data["fish"]:
-                if self.player.get_skill_level("Fishing") >= fish_info["level_req"]:
-                    possible_fish_to_catch.append(fish_info)
-                    total_chance_weight += fish_info["chance"]
+            # Fish catchable at the player's level, with running chance totals (precomputed per level tier)
+            possible_fish_to_catch, cumulative_chances = load_tables().catch_table(
+                self.current_spot_name, self.player.get_skill_level("Fishing"))
 
             if not possible_fish_to_catch:
                 print("You don't have the required level to catch anything here.")
@@ -101,12 +85,11 @@ class Fishing:
                 return
 
             # Randomly select a fish based on weighted chances
-            rand_val = random.uniform(0, total_chance_weight)
-            cumulative_chance = 0
+            total_chance_weight = cumulative_chances[-1]
+            rand_val = self.player.get_rng("Fishing").uniform(0, total_chance_weight) # Seeded per player, so catches can be replayed
             caught_fish_info = None
 
-            for fish_info in possible_fish_to_catch:
-                cumulative_chance += fish_info["chance"]
+            for fish_info, cumulative_chance in zip(possible_fish_to_catch, cumulative_chances):
                 if rand_val <= cumulative_chance:
                     caught_fish_info = fish_info
                     break
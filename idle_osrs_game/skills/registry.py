@@ -0,0 +1,38 @@
+import time
+
+from .woodcutting import Woodcutting, TREES
+from .mining import Mining, ROCKS
+from .fishing import Fishing, FISH_DATA
+from .firemaking import Firemaking, LOG_FIRE_DATA
+
+# Skill name -> manager class
+SKILL_MANAGERS = {
+    "Woodcutting": Woodcutting,
+    "Mining": Mining,
+    "Fishing": Fishing,
+    "Firemaking": Firemaking,
+}
+
+# Command action -> the skill it drives, the data table its argument is looked up in,
+# and the manager method that starts it. Optional keys: "quantity", "queues" and
+# "subcommands" (word -> manager method taking no arguments).
+SKILL_ACTIONS = {
+    "wc": {"skill": "Woodcutting", "table": TREES, "start": "start_cutting",
+           "kind": "tree", "usage": "wc <tree name> (e.g., wc Normal Tree)"},
+    "mine": {"skill": "Mining", "table": ROCKS, "start": "start_mining",
+             "kind": "rock", "usage": "mine <rock name> (e.g., mine Copper Ore)"},
+    "fish": {"skill": "Fishing", "table": FISH_DATA, "start": "start_fishing",
+             "kind": "fishing spot", "usage": "fish <spot name> (e.g., fish Netting Spot)"},
+    "burn": {"skill": "Firemaking", "table": LOG_FIRE_DATA, "start": "start_burning",
+             "kind": "log", "usage": "burn [all|<count>] <log name> | burn queue (e.g., burn all Oak Log)",
+             "quantity": True, # Accepts a leading count or "all" (passed to start as quantity, None for all)
+             "queues": True, # Adds to the manager's queue rather than replacing what it is doing
+             "subcommands": {"queue": "show_queue"}},
+}
+
+ACTION_TABLES = {action: spec["table"] for action, spec in SKILL_ACTIONS.items()}
+
+
+def create_skill_managers(player, clock=time.time):
+    """Creates one manager per skill for player, all reading time from clock."""
+    return {skill_name: manager_class(player, clock) for skill_name, manager_class in SKILL_MANAGERS.items()}
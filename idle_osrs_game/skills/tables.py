@@ -0,0 +1,225 @@
+import bisect
+import functools
+import json
+import os
+from types import MappingProxyType
+
+# The skill data tables live as JSON in data/tables/. They are validated and indexed once
+# per process, on first use.
+TABLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "tables")
+
+TABLE_FILES = {
+    "trees": "woodcutting.json",
+    "rocks": "mining.json",
+    "fish": "fishing.json",
+    "logs": "firemaking.json",
+}
+
+# Skill -> (table, XP field, seconds-per-action field, produced item field)
+SKILL_TABLES = {
+    "Woodcutting": ("trees", "xp", "respawn_time", "log_id"),
+    "Mining": ("rocks", "xp", "respawn_time", "ore_id"),
+    "Fishing": ("fish", "xp_per_fish", "action_time", None),
+    "Firemaking": ("logs", "xp", "duration", None),
+}
+
+MAX_INDEXED_LEVEL = 99 # best_activity() treats higher levels as this one
+
+_REQUIRED_FIELDS = {
+    "trees": {"level_req": int, "xp": (int, float), "log_id": str, "respawn_time": (int, float)},
+    "rocks": {"level_req": int, "xp": (int, float), "ore_id": str, "respawn_time": (int, float)},
+    "fish": {"level_req": int, "xp_per_fish": (int, float), "action_time": (int, float), "fish": list},
+    "logs": {"level_req": int, "xp": (int, float), "duration": (int, float)},
+}
+_FISH_FIELDS = {"id": str, "name": str, "level_req": int, "chance": (int, float)}
+
+
+class DataTableError(ValueError):
+    """Raised when the data tables fail validation. Lists every problem found."""
+
+
+def _check_fields(errors, where, entry, fields):
+    if not isinstance(entry, dict):
+        errors.append(f"{where}: expected an object")
+        return False
+    ok = True
+    for field, kind in fields.items():
+        value = entry.get(field)
+        if value is None:
+            errors.append(f"{where}: missing '{field}'")
+            ok = False
+        elif not isinstance(value, kind) or isinstance(value, bool):
+            errors.append(f"{where}: '{field}' has the wrong type")
+            ok = False
+        elif kind is not str and kind is not list and value < (1 if field == "level_req" else 0):
+            errors.append(f"{where}: '{field}' must not be below {1 if field == 'level_req' else 0}")
+            ok = False
+    return ok
+
+
+def validate_tables(tables):
+    """Checks field types and ranges plus cross-references between tables.
+    Raises DataTableError listing every problem.
+    """
+    errors = []
+    for table_name, fields in _REQUIRED_FIELDS.items():
+        table = tables.get(table_name)
+        if not isinstance(table, dict) or not table:
+            errors.append(f"{TABLE_FILES[table_name]}: expected a non-empty object")
+            continue
+        for name, entry in table.items():
+            where = f"{TABLE_FILES[table_name]} '{name}'"
+            if not _check_fields(errors, where, entry, fields):
+                continue
+            for field in ("respawn_time", "action_time", "duration"):
+                if field in fields and entry[field] <= 0:
+                    errors.append(f"{where}: '{field}' must be positive")
+            if table_name == "fish":
+                if not entry["fish"]:
+                    errors.append(f"{where}: 'fish' must not be empty")
+                for i, fish in enumerate(entry["fish"]):
+                    if _check_fields(errors, f"{where} fish #{i + 1}", fish, _FISH_FIELDS) and "xp" in fish:
+                        xp = fish["xp"] # Optional per-fish override of the spot's xp_per_fish
+                        if not isinstance(xp, (int, float)) or isinstance(xp, bool) or xp < 0:
+                            errors.append(f"{where} fish #{i + 1}: 'xp' must be a non-negative number")
+                if all(isinstance(fish, dict) and isinstance(fish.get("level_req"), int) for fish in entry["fish"]):
+                    if entry["fish"] and min(fish["level_req"] for fish in entry["fish"]) > entry["level_req"]:
+                        errors.append(f"{where}: nothing can be caught at the spot's own level {entry['level_req']}")
+
+    # Cross-references: every log Woodcutting produces must be burnable
+    trees, logs = tables.get("trees"), tables.get("logs")
+    if isinstance(trees, dict) and isinstance(logs, dict):
+        for tree_name, tree in trees.items():
+            if not isinstance(tree, dict) or not isinstance(tree.get("log_id"), str) or tree["log_id"] in logs:
+                continue
+            errors.append(f"{TABLE_FILES['trees']} '{tree_name}': log_id '{tree['log_id']}' "
+                          f"has no entry in {TABLE_FILES['logs']}")
+    if errors:
+        raise DataTableError("Invalid data tables:\n  " + "\n  ".join(errors))
+
+
+def _catch_tiers(spot):
+    """Per fishing level threshold, the catchable fish (in table order) and their running
+    chance totals, accumulated exactly as a per-catch scan of the fish list would.
+    """
+    tiers = []
+    for tier_level in sorted({fish["level_req"] for fish in spot["fish"]}):
+        catchable = [fish for fish in spot["fish"] if fish["level_req"] <= tier_level]
+        cumulative = []
+        total = 0
+        for fish in catchable:
+            total += fish["chance"]
+            cumulative.append(total)
+        tiers.append((tier_level, catchable, cumulative))
+    return tiers
+
+
+def _xp_per_second(skill_name, entry, level):
+    _, xp_field, time_field, _ = SKILL_TABLES[skill_name]
+    if skill_name != "Fishing":
+        return entry[xp_field] / entry[time_field]
+    catchable = [fish for fish in entry["fish"] if fish["level_req"] <= level]
+    total_chance = sum(fish["chance"] for fish in catchable)
+    if not total_chance:
+        return 0
+    expected_xp = sum(fish["chance"] * fish.get("xp", entry["xp_per_fish"]) for fish in catchable) / total_chance
+    return expected_xp / entry[time_field]
+
+
+def compile_tables(tables):
+    """Validates the raw tables and builds their lookup indexes.
+    Returns a plain dict; CompiledTables wraps it in read-only views.
+    """
+    validate_tables(tables)
+
+    unlocks = {}
+    best = {}
+    for skill_name, (table_name, _, _, _) in SKILL_TABLES.items():
+        table = tables[table_name]
+        unlocks[skill_name] = sorted((entry["level_req"], name) for name, entry in table.items())
+        best_by_level = [None]
+        for level in range(1, MAX_INDEXED_LEVEL + 1):
+            # Ties go to the higher-requirement resource (e.g. Iron over Copper at equal XP/s)
+            rates = [(_xp_per_second(skill_name, entry, level), entry["level_req"], name)
+                     for name, entry in table.items() if entry["level_req"] <= level]
+            best_by_level.append(max(rates)[2] if rates and max(rates)[0] > 0 else None)
+        best[skill_name] = best_by_level
+
+    item_sources = {}
+    for skill_name, (table_name, _, _, item_field) in SKILL_TABLES.items():
+        for name, entry in tables[table_name].items():
+            produced = [entry[item_field]] if item_field else [fish["id"] for fish in entry.get("fish", [])]
+            for item_id in produced:
+                item_sources.setdefault(item_id, []).append((skill_name, name))
+
+    catch_tiers = {name: _catch_tiers(spot) for name, spot in tables["fish"].items()}
+
+    return {
+        "tables": tables,
+        "unlocks": unlocks,
+        "best": best,
+        "item_sources": item_sources,
+        "catch_tiers": catch_tiers,
+    }
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class CompiledTables:
+    """Validated, read-only skill data with precomputed indexes."""
+
+    def __init__(self, compiled):
+        tables = _freeze(compiled["tables"])
+        self.trees = tables["trees"]
+        self.rocks = tables["rocks"]
+        self.fish = tables["fish"]
+        self.logs = tables["logs"]
+        self._unlocks = {skill: (tuple(level for level, _ in entries), tuple(name for _, name in entries))
+                         for skill, entries in compiled["unlocks"].items()}
+        self._best = _freeze(compiled["best"])
+        self._item_sources = _freeze(compiled["item_sources"])
+        self._catch_tiers = {spot: (tuple(tier[0] for tier in tiers), _freeze([tier[1:] for tier in tiers]))
+                             for spot, tiers in compiled["catch_tiers"].items()}
+
+    def unlocked(self, skill_name, level):
+        """Names of the skill's resources usable at level, lowest requirement first."""
+        levels, names = self._unlocks[skill_name]
+        return names[:bisect.bisect_right(levels, level)]
+
+    def best_activity(self, skill_name, level):
+        """Resource with the highest XP per second at level, or None if none is unlocked."""
+        best_by_level = self._best[skill_name]
+        return best_by_level[min(max(level, 0), MAX_INDEXED_LEVEL)]
+
+    def item_sources(self, item_id):
+        """(skill, resource name) pairs that produce item_id."""
+        return self._item_sources.get(item_id, ())
+
+    def catch_table(self, spot_name, level):
+        """(catchable fish, running chance totals) at spot_name for a Fishing level,
+        or ((), ()) if nothing there can be caught yet.
+        """
+        levels, tiers = self._catch_tiers[spot_name]
+        i = bisect.bisect_right(levels, level)
+        return tiers[i - 1] if i else ((), ())
+
+
+@functools.lru_cache(maxsize=None)
+def load_tables(tables_dir=TABLES_DIR):
+    """Returns the CompiledTables for tables_dir, compiling them on first use.
+    Raises DataTableError if the tables are invalid.
+    """
+    tables = {}
+    for table_name, file_name in TABLE_FILES.items():
+        try:
+            with open(os.path.join(tables_dir, file_name), "r", encoding="utf-8") as f:
+                tables[table_name] = json.load(f)
+        except ValueError as e:
+            raise DataTableError(f"Invalid JSON in {file_name}: {e}")
+    return CompiledTables(compile_tables(tables))
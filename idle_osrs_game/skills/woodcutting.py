@@ -1,21 +1,14 @@
 import time
 
-# Define tree types and their properties
-# Merged TREES dictionary, prioritizing feature branch's more extensive list
-# and adjusting Oak Tree respawn time to align with feature branch.
-TREES = {
-    "Normal Tree":  {"level_req": 1,  "xp": 25,    "log_id": "normal_log",   "respawn_time": 5},
-    "Oak Tree":     {"level_req": 15, "xp": 37.5,  "log_id": "oak_log",      "respawn_time": 8}, # Adjusted from main's 10 to feature's 8
-    "Willow Tree":  {"level_req": 30, "xp": 67.5,  "log_id": "willow_log",   "respawn_time": 12},
-    "Teak Tree":    {"level_req": 35, "xp": 85,    "log_id": "teak_log",     "respawn_time": 15},
-    "Maple Tree":   {"level_req": 45, "xp": 100,   "log_id": "maple_log",    "respawn_time": 20},
-    "Mahogany Tree":{"level_req": 50, "xp": 125,   "log_id": "mahogany_log", "respawn_time": 25},
-    "Yew Tree":     {"level_req": 60, "xp": 175,   "log_id": "yew_log",      "respawn_time": 30},
-}
+from .tables import load_tables
+
+# Tree types and their properties: level_req, xp, log_id (the log produced), respawn_time (seconds)
+TREES = load_tables().trees # data/tables/woodcutting.json, validated on load
 
 class Woodcutting:
-    def __init__(self, player):
+    def __init__(self, player, clock=time.time):
         self.player = player
+        self.clock = clock # time.time, or a GameClock for replays and simulations
         self.is_cutting = False
         self.current_tree = None
         self.tree_depleted_at = 0
@@ -27,7 +20,9 @@ class Woodcutting:
 
         tree_data = TREES[tree_name]
         if self.player.get_skill_level("Woodcutting") < tree_data["level_req"]:
-            print(f"You need level {tree_data['level_req']} Woodcutting to cut {tree_name}.")
+            unlocked = load_tables().unlocked("Woodcutting", self.player.get_skill_level("Woodcutting"))
+            print(f"You need level {tree_data['level_req']} Woodcutting to cut {tree_name}. "
+                  f"At your level: {', '.join(unlocked)}.")
             return
 
         self.is_cutting = True
@@ -43,13 +38,19 @@ class Woodcutting:
             self.player.clear_active_skill()
             print("You stop cutting.")
 
+    def next_action_at(self):
+        """Time at which update() will next do something, or None if it never will."""
+        if not self.is_cutting or not self.current_tree:
+            return None
+        return self.tree_depleted_at
+
     def update(self):
         if not self.is_cutting or not self.current_tree:
             return
 
         tree_data = TREES[self.current_tree]
 
-        if time.time() < self.tree_depleted_at:
+        if self.clock() < self.tree_depleted_at:
             return # Tree hasn't respawned yet
 
         # Simulate cutting action
@@ -57,7 +58,7 @@ class Woodcutting:
         self.player.add_item_to_inventory(tree_data["log_id"], 1)
         # Player's add_item_to_inventory should handle the success message
 
-        self.tree_depleted_at = time.time() + tree_data["respawn_time"]
+        self.tree_depleted_at = self.clock() + tree_data["respawn_time"]
         print(f"The {self.current_tree} is depleted. It will respawn in {tree_data['respawn_time']} seconds.")
 
         # For continuous cutting until stopped by player (desired behavior for idle game):